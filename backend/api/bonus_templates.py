@@ -2,29 +2,49 @@
 API endpoints for Bonus Templates
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import json as json_lib
+import logging
 
-from database.database import get_db
+from database.database import get_db, get_read_db, read_sessionmaker
 from database.models import BonusTemplate, BonusTranslation
-from api.schemas import BonusTemplateCreate, BonusTemplateResponse, BonusTranslationCreate, BonusTranslationResponse, BonusJSONOutput
-from services.json_generator import generate_bonus_json_with_currencies
+from api.responses import cached_json_response
+from api.schemas import BonusTemplateCreate, BonusTemplateResponse, BonusTranslationCreate, BonusTranslationResponse, BonusJSONOutput, BulkTranslationsRequest, BulkTranslationsResponse, BulkSimpleTemplatesResponse
+from services.json_generator import generate_bonus_json_with_currencies, build_template_json
+from services.template_export import stream_export, stream_xlsx_export, EXPORT_FORMATS, DEFAULT_BATCH_SIZE
+from services.template_import import import_workbook
+from services.config_import import import_config_file
+from services.simple_templates import build_simple_template, create_simple_templates
+from services.search_index import search_template_ids
+from services.date_ranges import parse_date_query, period_range
+from services.pagination import keyset_page, order_newest_first
+from services.template_fields import SCALAR_FIELDS, SUMMARY_FIELDS, parse_fields, template_columns
+from services.render_cache import render_cache, serialize_rendered, etag_matches, RenderedTemplate
+from services.stable_config_cache import get_provider_config
+from services.translations import bulk_upsert_translations, upsert_translation
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Payloads accepted by one bulk create request
+MAX_BULK_TEMPLATES = 500
 
 
 # ============= BONUS TEMPLATES =============
 
 @router.post("/bonus-templates", response_model=BonusTemplateResponse, status_code=status.HTTP_201_CREATED)
-def create_bonus_template(template: BonusTemplateCreate, db: Session = Depends(get_db)):
+async def create_bonus_template(template: BonusTemplateCreate, db: AsyncSession = Depends(get_db)):
     """Create a new bonus template"""
 
     # Check if template with this ID already exists
-    existing = db.query(BonusTemplate).filter(
-        BonusTemplate.id == template.id).first()
+    existing = await db.scalar(select(BonusTemplate).where(
+        BonusTemplate.id == template.id))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -60,13 +80,13 @@ def create_bonus_template(template: BonusTemplateCreate, db: Session = Depends(g
     )
 
     db.add(db_template)
-    db.commit()
-    db.refresh(db_template)
+    await db.commit()
+    await db.refresh(db_template)
     return db_template
 
 
 @router.post("/bonus-templates/simple", status_code=status.HTTP_201_CREATED)
-def create_bonus_template_simple(payload: Dict[str, Any], db: Session = Depends(get_db)):
+async def create_bonus_template_simple(payload: Dict[str, Any], db: AsyncSession = Depends(get_db)):
     """Create a bonus template using simple JSON format (deposit form)
 
     Accepts the simplified format:
@@ -78,111 +98,29 @@ def create_bonus_template_simple(payload: Dict[str, Any], db: Session = Depends(
     }
     """
     try:
-        template_id = payload.get("id")
-        if not template_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Missing required field: id"
-            )
+        values, final_json = build_simple_template(payload)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    template_id = values["id"]
 
+    try:
         # Check if template with this ID already exists
-        existing = db.query(BonusTemplate).filter(
-            BonusTemplate.id == template_id).first()
+        existing = await db.scalar(select(BonusTemplate).where(
+            BonusTemplate.id == template_id))
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Template with ID '{template_id}' already exists"
             )
 
-        trigger = payload.get("trigger", {})
-        config = payload.get("config", {})
-
-        # Extract just the cap values from maximumWithdraw if they exist
-        max_withdraw = config.get("maximumWithdraw", {})
-        print(f"DEBUG POST: max_withdraw from payload = {max_withdraw}")
-        print(f"DEBUG POST: max_withdraw type = {type(max_withdraw)}")
-
-        max_withdraw_flattened = {}
-        for curr, val in max_withdraw.items():
-            if isinstance(val, dict):
-                max_withdraw_flattened[curr] = val.get("cap", 0)
-            else:
-                max_withdraw_flattened[curr] = val
-
-        print(f"DEBUG POST: max_withdraw_flattened = {max_withdraw_flattened}")
-
-        # Build the FINAL JSON that will be stored - only include what was provided
-        final_json = {
-            "id": template_id,
-            "type": "bonus_template"
-        }
-
-        # Add trigger if provided
-        if trigger:
-            trigger_obj = {}
-            if trigger.get("type"):
-                trigger_obj["type"] = trigger["type"]
-            if trigger.get("duration"):
-                trigger_obj["duration"] = trigger["duration"]
-            if trigger.get("schedule"):
-                trigger_obj["schedule"] = trigger["schedule"]
-            if trigger_obj:
-                final_json["trigger"] = trigger_obj
-
-        # Add config if provided
-        if config:
-            config_obj = {}
-            if config.get("cost"):
-                config_obj["cost"] = config["cost"]
-            if config.get("multiplier"):
-                config_obj["multiplier"] = config["multiplier"]
-            if config.get("maximumBets"):
-                config_obj["maximumBets"] = config["maximumBets"]
-            if max_withdraw_flattened:
-                config_obj["maximumWithdraw"] = max_withdraw_flattened
-            if config.get("provider"):
-                config_obj["provider"] = config["provider"]
-            if config.get("brand"):
-                config_obj["brand"] = config["brand"]
-            if config.get("type"):
-                config_obj["type"] = config["type"]
-            if config.get("category"):
-                config_obj["category"] = config["category"]
-            if config.get("extra"):
-                config_obj["extra"] = config["extra"]
-            if config_obj:
-                final_json["config"] = config_obj
-
         # Create new template with simple format
-        db_template = BonusTemplate(
-            id=template_id,
-            trigger_name={"*": "Bonus", "en": "Bonus"},
-            trigger_description={"*": "", "en": ""},
-            trigger_type=trigger.get("type", "deposit"),
-            trigger_iterations=1,
-            trigger_duration=trigger.get("duration", "7d"),
-            minimum_amount={"*": 0},
-            percentage=0,
-            wagering_multiplier=0,
-            minimum_stake_to_wager={"*": 0},
-            maximum_stake_to_wager=config.get("maximumBets", {"*": 0}),
-            maximum_amount=config.get("cost", {"*": 0}),
-            maximum_withdraw=max_withdraw_flattened,
-            category=config.get("category", "games"),
-            provider=config.get("provider", "PRAGMATIC"),
-            brand=config.get("brand", "PRAGMATIC"),
-            bonus_type=config.get("type", "cost"),
-        )
-
-        # Handle optional schedule
-        if trigger.get("schedule"):
-            schedule = trigger["schedule"]
-            db_template.schedule_from = schedule.get("from")
-            db_template.schedule_to = schedule.get("to")
-
+        db_template = BonusTemplate(**values)
         db.add(db_template)
-        db.commit()
-        db.refresh(db_template)
+        await db.commit()
+        await db.refresh(db_template)
 
         return {
             "status": "created",
@@ -193,24 +131,82 @@ def create_bonus_template_simple(payload: Dict[str, Any], db: Session = Depends(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/bonus-templates/simple/bulk", response_model=BulkSimpleTemplatesResponse, status_code=status.HTTP_201_CREATED)
+async def create_bonus_templates_simple_bulk(
+    payloads: List[Dict[str, Any]],
+    all_or_nothing: bool = True,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create many bonus templates from an array of simple JSON payloads
+
+    Existing IDs are found with one query and all templates are inserted in one
+    statement and one transaction. With all_or_nothing (default) any invalid,
+    repeated or existing ID fails the whole request with 409 and the per-item
+    results; otherwise the valid items are created and the rest reported.
+    """
+    if len(payloads) > MAX_BULK_TEMPLATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_TEMPLATES} templates per request"
+        )
+
+    try:
+        results, created = await create_simple_templates(db, payloads, all_or_nothing)
+        if all_or_nothing and created < len(payloads):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "No templates were created", "results": results}
+            )
+        await db.commit()
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
+    return {"results": results, "created": created, "failed": len(payloads) - created}
+
 
 @router.get("/bonus-templates")
-def list_bonus_templates(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all bonus templates"""
-    templates = db.query(BonusTemplate).offset(skip).limit(limit).all()
-    return [{"id": t.id, "provider": t.provider, "bonus_type": t.bonus_type, "created_at": t.created_at} for t in templates]
+async def list_bonus_templates(skip: int = 0, limit: int = Query(100, ge=1, le=1000), cursor: Optional[str] = None, fields: Optional[str] = None, db: AsyncSession = Depends(get_read_db)):
+    """List all bonus templates, newest first
+
+    Pass `cursor` (empty for the first page) for keyset pagination; the response is
+    then {"items": [...], "next_cursor": ...}. Without it, skip/limit return a plain list.
+    `fields` is a comma-separated list of template fields ("*" for all); the
+    default is id, provider, bonus_type and created_at.
+    """
+    names = _fieldset(fields, SUMMARY_FIELDS)
+
+    if cursor is not None:
+        return await _cursor_page(db, names, [], cursor, limit)
+
+    rows = (await db.execute(order_newest_first(
+        select(*template_columns(names))).offset(skip).limit(limit))).all()
+    return ORJSONResponse(_project(rows, names))
 
 
 @router.get("/bonus-templates/search")
-def search_bonus_template(query: str, db: Session = Depends(get_db)):
-    """Search for bonus templates by ID (partial match), date, or other fields"""
-    from sqlalchemy import or_, func
+async def search_bonus_template(query: str, limit: int = Query(50, ge=1, le=500), fields: Optional[str] = None, db: AsyncSession = Depends(get_read_db)):
+    """Search for bonus templates by ID (partial match), date, or other fields
+
+    Text matches come from the search index, best matches first, followed by
+    templates created on the date the query names (YYYY-MM-DD, YYYY-MM or YYYY).
+    `fields` selects the returned template fields ("*" for all); the default
+    is every field except the per-language and per-currency maps.
+    """
+    names = _fieldset(fields, SCALAR_FIELDS)
 
     if not query.strip():
         raise HTTPException(
@@ -221,210 +217,378 @@ def search_bonus_template(query: str, db: Session = Depends(get_db)):
     query_str = query.strip()
 
     # Try to parse as date (YYYY-MM-DD, YYYY-MM, or YYYY formats)
-    date_filter = None
-    if len(query_str) == 10 and query_str.count('-') == 2:  # YYYY-MM-DD
-        date_filter = query_str
-    elif len(query_str) == 7 and query_str.count('-') == 1:  # YYYY-MM
-        date_filter = query_str
-    elif len(query_str) == 4 and query_str.isdigit():  # YYYY
-        date_filter = query_str
-
-    # Build the query with multiple conditions
-    conditions = [
-        BonusTemplate.id.ilike(f"%{query_str}%"),  # Partial ID match
-        BonusTemplate.provider.ilike(f"%{query_str}%"),
-        BonusTemplate.brand.ilike(f"%{query_str}%"),
-        BonusTemplate.category.ilike(f"%{query_str}%"),
-    ]
-
-    # Add date-based filtering if query looks like a date
-    if date_filter:
-        if len(date_filter) == 10:  # YYYY-MM-DD
-            conditions.append(func.strftime(
-                '%Y-%m-%d', BonusTemplate.created_at) == date_filter)
-        elif len(date_filter) == 7:  # YYYY-MM
-            conditions.append(func.strftime(
-                '%Y-%m', BonusTemplate.created_at) == date_filter)
-        elif len(date_filter) == 4:  # YYYY
-            conditions.append(func.strftime(
-                '%Y', BonusTemplate.created_at) == date_filter)
-
-    templates = db.query(BonusTemplate).filter(or_(*conditions)).all()
-
-    if not templates:
+    date_range = parse_date_query(query_str)
+
+    # Ranked text matches on id, provider, brand and category
+    template_ids = await search_template_ids(db, query_str, limit)
+
+    # Add date-based matches if query looks like a date
+    if date_range and len(template_ids) < limit:
+        start, end = date_range
+        date_ids = (await db.scalars(select(BonusTemplate.id).where(
+            BonusTemplate.created_at >= start,
+            BonusTemplate.created_at < end
+        ).order_by(desc(BonusTemplate.created_at)).limit(limit))).all()
+        seen = set(template_ids)
+        for template_id in date_ids:
+            if template_id not in seen and len(template_ids) < limit:
+                template_ids.append(template_id)
+                seen.add(template_id)
+
+    if not template_ids:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No bonuses found matching: {query_str}"
         )
 
-    return templates
+    # Load the matches and keep the ranked order
+    templates_by_id = {row["id"]: row for row in _project((await db.execute(
+        select(*template_columns(names)).where(BonusTemplate.id.in_(template_ids)))).all(), names)}
+    return ORJSONResponse([templates_by_id[t_id] for t_id in template_ids if t_id in templates_by_id])
 
 
 @router.get("/bonus-templates/dates/{year}/{month}")
-def get_bonuses_by_month(year: int, month: int, skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
-    """Get bonus templates created in a specific month with pagination"""
-    from sqlalchemy import desc, func
+async def get_bonuses_by_month(year: int, month: int, skip: int = 0, limit: int = Query(50, ge=1, le=1000), cursor: Optional[str] = None, fields: Optional[str] = None, db: AsyncSession = Depends(get_read_db)):
+    """Get bonus templates created in a specific month with pagination
+
+    Pass `cursor` (empty for the first page) for keyset pagination, and `fields`
+    for a sparse fieldset, as in list_bonus_templates.
+    """
+    names = _fieldset(fields, SUMMARY_FIELDS)
+
+    logger.debug("Fetching bonuses for %s-%s, skip=%s, limit=%s, cursor=%s",
+                 year, month, skip, limit, cursor)
 
-    print(
-        f"[DEBUG] Fetching bonuses for {year}-{month}, skip={skip}, limit={limit}")
+    try:
+        start, end = period_range(year, month)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid month: {year}-{month}"
+        )
+
+    # Half-open range on created_at so the created_at index can be used
+    conditions = [
+        BonusTemplate.created_at >= start,
+        BonusTemplate.created_at < end
+    ]
+
+    if cursor is not None:
+        return await _cursor_page(db, names, conditions, cursor, limit)
+
+    rows = (await db.execute(order_newest_first(
+        select(*template_columns(names)).where(*conditions)).offset(skip).limit(limit))).all()
+
+    logger.debug("Found %d bonuses", len(rows))
+    return ORJSONResponse(_project(rows, names))
+
+
+def _fieldset(fields: Optional[str], default) -> List[str]:
+    try:
+        return parse_fields(fields, default)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
-    # SQLite-compatible date filtering using strftime
-    templates = db.query(BonusTemplate).filter(
-        func.strftime(
-            '%Y-%m', BonusTemplate.created_at) == f"{year:04d}-{month:02d}"
-    ).order_by(desc(BonusTemplate.created_at)).offset(skip).limit(limit).all()
 
-    print(f"[DEBUG] Found {len(templates)} bonuses")
-    return [{"id": t.id, "provider": t.provider, "bonus_type": t.bonus_type, "created_at": t.created_at} for t in templates]
+def _project(rows, names: List[str]) -> List[Dict[str, Any]]:
+    # Rows may carry extra columns (the cursor keys); only names are returned.
+    # The views return these plain dicts as ORJSONResponse, skipping jsonable_encoder.
+    return [{name: row._mapping[name] for name in names} for row in rows]
+
+
+async def _cursor_page(db: AsyncSession, names: List[str], conditions: list, cursor: str, limit: int) -> Dict[str, Any]:
+    # The next cursor is built from the last row's created_at and id
+    query = select(*template_columns(names, "created_at", "id")).where(*conditions)
+    try:
+        rows, next_cursor = await keyset_page(db, query, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return ORJSONResponse({"items": _project(rows, names), "next_cursor": next_cursor})
+
+
+@router.get("/bonus-templates/export")
+async def export_bonus_templates(
+    request: Request,
+    format: str = "ndjson",
+    provider: Optional[str] = None,
+    brand: Optional[str] = None,
+    month: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=5000),
+    currencies: bool = False,
+):
+    """Stream all matching templates as NDJSON, a JSON array or an .xlsx workbook
+
+    Filters: provider, brand and either month ("YYYY-MM") or a half-open
+    created_at range [created_from, created_to).
+    currencies=true adds converted amounts and stakes for every currency (JSON formats).
+    xlsx has one row per template with one column per currency and per
+    translation language, and can be re-imported with POST /bonus-templates/import.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    if month is not None:
+        if created_from or created_to:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use either month or created_from/created_to"
+            )
+        try:
+            parsed = datetime.strptime(month, "%Y-%m")
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid month '{month}'. Use YYYY-MM"
+            )
+        created_from, created_to = period_range(parsed.year, parsed.month)
+
+    filters = dict(provider=provider, brand=brand,
+                   created_from=created_from, created_to=created_to)
+    session_factory = read_sessionmaker(request)
+
+    if format == "xlsx":
+        return StreamingResponse(
+            stream_xlsx_export(batch_size=batch_size, session_factory=session_factory, **filters),
+            media_type=EXPORT_FORMATS[format],
+            headers={"Content-Disposition": 'attachment; filename="bonus_templates.xlsx"'},
+        )
+
+    return StreamingResponse(
+        stream_export(
+            export_format=format,
+            batch_size=batch_size,
+            convert_currencies=currencies,
+            session_factory=session_factory,
+            **filters,
+        ),
+        media_type=EXPORT_FORMATS[format],
+    )
+
+
+@router.post("/bonus-templates/import")
+async def import_bonus_templates(
+    file: UploadFile = File(...),
+    sheet: Optional[str] = None,
+    update_existing: bool = False,
+):
+    """Import templates and translations from an Excel workbook (.xlsx)
+
+    Rows are streamed and written in chunked bulk inserts. Invalid rows and
+    existing IDs (unless update_existing) are returned as per-row errors.
+    """
+    try:
+        result = await run_in_threadpool(
+            import_workbook, file.file, sheet=sheet, update_existing=update_existing)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return result.as_dict()
+
+
+@router.post("/bonus-templates/import/config")
+async def import_bonus_config(
+    file: UploadFile = File(...),
+    prefix: Optional[str] = None,
+    update_existing: bool = True,
+):
+    """Import templates and translations from a config.json export
+
+    The file is parsed incrementally (an array of bonuses by default; pass an
+    ijson `prefix` such as "bonuses.item" for other layouts) and upserted in
+    chunks. Invalid bonuses are returned as errors by position in the file.
+    """
+    result = await run_in_threadpool(
+        import_config_file, file.file, prefix=prefix, update_existing=update_existing)
+    return result.as_dict()
 
 
 @router.get("/bonus-templates/{template_id}")
-def get_bonus_template(template_id: str, db: Session = Depends(get_db)):
-    """Get a specific bonus template"""
-    template = db.query(BonusTemplate).filter(
-        BonusTemplate.id == template_id).first()
-    if not template:
+async def get_bonus_template(template_id: str, fields: Optional[str] = None, db: AsyncSession = Depends(get_read_db)):
+    """Get a specific bonus template
+
+    `fields` selects the returned template fields ("*" for all); the default is
+    id, provider, bonus_type and created_at.
+    """
+    names = _fieldset(fields, SUMMARY_FIELDS)
+    row = (await db.execute(select(*template_columns(names)).where(
+        BonusTemplate.id == template_id))).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Template '{template_id}' not found"
         )
-    return {"id": template.id, "provider": template.provider, "bonus_type": template.bonus_type, "created_at": template.created_at}
+    return ORJSONResponse(_project([row], names)[0])
 
 
 @router.put("/bonus-templates/{template_id}", response_model=BonusTemplateResponse)
-def update_bonus_template(template_id: str, template_update: BonusTemplateCreate, db: Session = Depends(get_db)):
+async def update_bonus_template(template_id: str, template_update: BonusTemplateCreate, db: AsyncSession = Depends(get_db)):
     """Update a bonus template"""
-    template = db.query(BonusTemplate).filter(
-        BonusTemplate.id == template_id).first()
+    template = await db.scalar(select(BonusTemplate).where(
+        BonusTemplate.id == template_id))
     if not template:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Template '{template_id}' not found"
         )
 
+    # Renaming only changes the template row; translations reference its pk
+    if template_update.id != template_id and await db.scalar(select(BonusTemplate.pk).where(
+            BonusTemplate.id == template_update.id)) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Template with ID '{template_update.id}' already exists"
+        )
+
     # Update fields
     for field, value in template_update.dict().items():
         setattr(template, field, value)
 
     template.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(template)
+    await db.commit()
+    render_cache.invalidate(template_id)
+    render_cache.invalidate(template.id)
+    await db.refresh(template)
     return template
 
 
 @router.delete("/bonus-templates/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_bonus_template(template_id: str, db: Session = Depends(get_db)):
+async def delete_bonus_template(template_id: str, db: AsyncSession = Depends(get_db)):
     """Delete a bonus template"""
-    template = db.query(BonusTemplate).filter(
-        BonusTemplate.id == template_id).first()
+    template = await db.scalar(select(BonusTemplate).where(
+        BonusTemplate.id == template_id))
     if not template:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Template '{template_id}' not found"
         )
 
-    db.delete(template)
-    db.commit()
+    await db.delete(template)
+    await db.commit()
+    render_cache.invalidate(template_id)
     return None
 
 
 # ============= BONUS TRANSLATIONS =============
 
 @router.post("/bonus-templates/{template_id}/translations", status_code=status.HTTP_201_CREATED)
-def add_translation(template_id: str, translation: BonusTranslationCreate, db: Session = Depends(get_db)):
+async def add_translation(template_id: str, translation: BonusTranslationCreate, db: AsyncSession = Depends(get_db)):
     """Add a translation for a bonus template - updates if exists"""
 
     # Check if template exists
-    template = db.query(BonusTemplate).filter(
-        BonusTemplate.id == template_id).first()
+    template = await db.scalar(select(BonusTemplate).where(
+        BonusTemplate.id == template_id))
     if not template:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Template '{template_id}' not found"
         )
 
-    print(
-        f"[DEBUG] Saving translation for {template_id} - Language: {translation.language}")
-    print(
-        f"[DEBUG] Name: {translation.name}, Description: {translation.description}")
-
-    # Check if translation already exists for this language
-    existing_translation = db.query(BonusTranslation).filter(
-        BonusTranslation.template_id == template_id,
-        BonusTranslation.language == translation.language
-    ).first()
-
-    if existing_translation:
-        # Update existing translation
-        print(
-            f"[DEBUG] Updating existing translation for {translation.language}")
-        existing_translation.name = translation.name
-        existing_translation.description = translation.description
-        existing_translation.currency = translation.currency
-        db.commit()
-        db.refresh(existing_translation)
-        print(f"[DEBUG] Updated translation: {existing_translation.name}")
-        return existing_translation
-    else:
-        # Create new translation
-        print(f"[DEBUG] Creating new translation for {translation.language}")
-        db_translation = BonusTranslation(
-            template_id=template_id,
-            language=translation.language,
-            currency=translation.currency,
-            name=translation.name,
-            description=translation.description,
+    logger.debug("Saving translation for %s - Language: %s, Name: %s, Description: %s",
+                 template_id, translation.language, translation.name, translation.description)
+
+    # Single INSERT ... ON CONFLICT DO UPDATE on (template_pk, language)
+    saved_translation = await upsert_translation(
+        db,
+        template_pk=template.pk,
+        language=translation.language,
+        name=translation.name,
+        description=translation.description,
+        currency=translation.currency,
+    )
+    await db.commit()
+    render_cache.invalidate(template_id)
+    logger.debug("Saved translation: %s", saved_translation["name"])
+    return _translation_response(template.id, saved_translation)
+
+
+@router.post("/bonus-templates/translations/bulk", response_model=BulkTranslationsResponse)
+async def bulk_save_translations(request: BulkTranslationsRequest, db: AsyncSession = Depends(get_db)):
+    """Create or update translations for all languages of one or many templates
+
+    Everything is applied in a single transaction with set-based writes.
+    Languages of unknown templates are reported as "template_not_found".
+    """
+    try:
+        results, created, updated = await bulk_upsert_translations(
+            db, request.dict()["translations"])
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
 
-        db.add(db_translation)
-        db.commit()
-        db.refresh(db_translation)
-        print(f"[DEBUG] Created translation: {db_translation.name}")
-        return db_translation
+    for template_id, languages in results.items():
+        if any(outcome != "template_not_found" for outcome in languages.values()):
+            render_cache.invalidate(template_id)
+
+    return {"results": results, "created": created, "updated": updated}
+
+
+def _translation_response(template_id: str, translation: Dict[str, Any]) -> Dict[str, Any]:
+    """A bonus_translations row as returned by the API: with the template's ID instead of its pk"""
+    response = {key: value for key, value in translation.items() if key != "template_pk"}
+    response["template_id"] = template_id
+    return response
 
 
 @router.get("/bonus-templates/{template_id}/translations", response_model=List[BonusTranslationResponse])
-def get_translations(template_id: str, db: Session = Depends(get_db)):
+async def get_translations(template_id: str, db: AsyncSession = Depends(get_read_db)):
     """Get all translations for a bonus template"""
-    print(f"[DEBUG] Getting translations for bonus: {template_id}")
+    logger.debug("Getting translations for bonus: %s", template_id)
 
-    template = db.query(BonusTemplate).filter(
-        BonusTemplate.id == template_id).first()
+    template = await db.scalar(select(BonusTemplate).where(
+        BonusTemplate.id == template_id))
     if not template:
-        print(f"[DEBUG] Template {template_id} not found")
+        logger.debug("Template %s not found", template_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Template '{template_id}' not found"
         )
 
-    translations = db.query(BonusTranslation).filter(
-        BonusTranslation.template_id == template_id).all()
+    translations = (await db.execute(select(BonusTranslation.__table__).where(
+        BonusTranslation.template_pk == template.pk).order_by(BonusTranslation.id))).mappings().all()
 
-    print(f"[DEBUG] Found {len(translations)} translations")
-    for t in translations:
-        print(f"[DEBUG]   - {t.language}: {t.name}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Found %d translations: %s", len(translations),
+                     ", ".join(f"{t['language']}: {t['name']}" for t in translations))
 
-    return translations
+    return [_translation_response(template.id, translation) for translation in translations]
 
 
 @router.delete("/bonus-templates/{template_id}/translations/{language}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_translation(template_id: str, language: str, db: Session = Depends(get_db)):
+async def delete_translation(template_id: str, language: str, db: AsyncSession = Depends(get_db)):
     """Delete a translation for a bonus template"""
-    print(
-        f"[DEBUG] Deleting translation for {template_id} - Language: {language}")
+    logger.debug("Deleting translation for %s - Language: %s",
+                 template_id, language)
 
     # Find and delete the translation
-    translation = db.query(BonusTranslation).filter(
-        BonusTranslation.template_id == template_id,
+    translation = await db.scalar(select(BonusTranslation).join(BonusTranslation.template).where(
+        BonusTemplate.id == template_id,
         BonusTranslation.language == language
-    ).first()
+    ))
 
     if translation:
-        db.delete(translation)
-        db.commit()
-        print(f"[DEBUG] Deleted translation for {language}")
+        await db.delete(translation)
+        await db.commit()
+        render_cache.invalidate(template_id)
+        logger.debug("Deleted translation for %s", language)
     else:
-        print(f"[DEBUG] Translation for {language} not found")
+        logger.debug("Translation for %s not found", language)
 
     return None
 
@@ -432,12 +596,29 @@ def delete_translation(template_id: str, language: str, db: Session = Depends(ge
 # ============= JSON GENERATION =============
 
 @router.get("/bonus-templates/{template_id}/json")
-def generate_template_json(template_id: str, db: Session = Depends(get_db)):
-    """Generate the final JSON output for a bonus template with stored cost data and translations"""
+async def generate_template_json(template_id: str, if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None), db: AsyncSession = Depends(get_read_db)):
+    """Generate the final JSON output for a bonus template with stored cost data and translations
+
+    Responses are cached per template, serialized and gzipped once, and carry a
+    strong ETag; a matching If-None-Match gets 304 Not Modified.
+    """
+    rendered = render_cache.get(template_id)
+    if rendered is None:
+        rendered = await _render_template_json(template_id, db)
 
-    template = db.query(BonusTemplate).filter(
+    headers = {"ETag": rendered.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, rendered.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return cached_json_response(rendered, accept_encoding, headers)
+
+
+async def _render_template_json(template_id: str, db: AsyncSession) -> RenderedTemplate:
+    # Read the version before loading so a write that races this render is not cached
+    cache_version = render_cache.version
+
+    template = await db.scalar(select(BonusTemplate).where(
         BonusTemplate.id == template_id
-    ).first()
+    ))
 
     if not template:
         raise HTTPException(
@@ -445,109 +626,22 @@ def generate_template_json(template_id: str, db: Session = Depends(get_db)):
             detail=f"Template '{template_id}' not found"
         )
 
-    # Fetch admin config to get maximumWithdraw in proper format
-    from database.models import StableConfig
-    admin_config = db.query(StableConfig).filter(
-        StableConfig.provider == template.provider
-    ).first()
-
-    # Build maximumWithdraw in the nested format with "cap"
-    # Use stored template data if available, fallback to admin config
-    maximum_withdraw_formatted = {}
-
-    print(f"DEBUG: template.maximum_withdraw = {template.maximum_withdraw}")
-    print(
-        f"DEBUG: template.maximum_withdraw type = {type(template.maximum_withdraw)}")
-
-    if template.maximum_withdraw:
-        stored_data = template.maximum_withdraw
-        print(f"DEBUG: Using stored data: {stored_data}")
-        # If stored as flat dict/JSON, convert to nested format
-        if isinstance(stored_data, dict):
-            for curr, val in stored_data.items():
-                if isinstance(val, dict):
-                    # Already nested format
-                    maximum_withdraw_formatted[curr] = val
-                else:
-                    # Flat value, wrap in cap
-                    maximum_withdraw_formatted[curr] = {"cap": val}
-    # Fallback to admin config if stored data is empty
-    elif admin_config and admin_config.maximum_withdraw:
-        print(f"DEBUG: Using admin config data")
-        # Admin stores it as list of dicts with currency and cap
-        for item in admin_config.maximum_withdraw:
-            if isinstance(item, dict):
-                currency = item.get("currency")
-                cap = item.get("cap", 0)
-                if currency:
-                    maximum_withdraw_formatted[currency] = {"cap": cap}
-
-    print(
-        f"DEBUG: Final maximum_withdraw_formatted = {maximum_withdraw_formatted}")
+    # Admin config provides the maximumWithdraw fallback
+    admin_config = await get_provider_config(db, template.provider)
+
+    logger.debug("template.maximum_withdraw = %s (%s)",
+                 template.maximum_withdraw, type(template.maximum_withdraw).__name__)
 
     # Fetch translations for this template
-    translations = db.query(BonusTranslation).filter(
-        BonusTranslation.template_id == template_id
-    ).all()
-
-    # Build multilingual name and description from translations
-    trigger_name = {}
-    trigger_description = {}
-
-    for translation in translations:
-        if translation.language:
-            if translation.name:
-                trigger_name[translation.language] = translation.name
-            if translation.description:
-                trigger_description[translation.language] = translation.description
-
-    # Set "*" (default) to English or first available translation
-    if "en" in trigger_name:
-        trigger_name["*"] = trigger_name["en"]
-    elif trigger_name:
-        trigger_name["*"] = next(iter(trigger_name.values()))
-
-    if "en" in trigger_description:
-        trigger_description["*"] = trigger_description["en"]
-    elif trigger_description:
-        trigger_description["*"] = next(iter(trigger_description.values()))
-
-    # Build the full JSON from stored data
-    json_output = {
-        "id": template.id,
-        "trigger": {
-            "type": template.trigger_type,
-            "duration": template.trigger_duration,
-            "minimumAmount": template.minimum_amount,
-        },
-        "config": {
-            "cost": template.maximum_amount,
-            "multiplier": template.maximum_amount,
-            "maximumBets": template.maximum_stake_to_wager,
-            "provider": template.provider,
-            "brand": template.brand,
-            "type": template.bonus_type,
-            "category": template.category,
-            "maximumWithdraw": maximum_withdraw_formatted,
-            "extra": {
-                "category": template.category,
-                "game": template.bonus_type  # Get from template data
-            }
-        },
-        "type": "bonus_template"
-    }
+    translations = (await db.scalars(select(BonusTranslation).where(
+        BonusTranslation.template_pk == template.pk
+    ).order_by(BonusTranslation.id))).all()
 
-    # Add trigger name and description if they exist
-    if trigger_name:
-        json_output["trigger"]["name"] = trigger_name
-    if trigger_description:
-        json_output["trigger"]["description"] = trigger_description
-
-    # Add schedule if it exists
-    if template.schedule_from and template.schedule_to:
-        json_output["trigger"]["schedule"] = {
-            "from": template.schedule_from,
-            "to": template.schedule_to
-        }
+    json_output = build_template_json(template, translations, admin_config)
+
+    logger.debug("Final maximum_withdraw_formatted = %s",
+                 json_output["config"]["maximumWithdraw"])
 
-    return json_output
+    rendered = serialize_rendered(template.id, template.provider, json_output)
+    render_cache.put(rendered, cache_version)
+    return rendered
@@ -0,0 +1,128 @@
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, status
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from database.database import get_db
+from database.models import CurrencyReference, CurrencyReferenceVersion
+from api.schemas import CurrencyRatesResponse, CurrencyRatesUpdate
+from services.currency_service import (
+    CurrencySnapshot,
+    get_currency_snapshot,
+    install_currency_snapshot,
+    refresh_currency_snapshot,
+)
+from services.rate_recompute import (
+    RecomputeProgress,
+    changed_rates,
+    recompute_converted_amounts,
+    recompute_jobs,
+    track_job,
+)
+
+router = APIRouter()
+
+
+def _snapshot_response(snapshot: CurrencySnapshot) -> dict:
+    return {
+        "version": snapshot.version,
+        "rates": [
+            {"currency": currency, "eur_rate": values["rate"],
+             "min_deposit": values["min_deposit"], "max_deposit": values["max_deposit"]}
+            for currency, values in snapshot.rates.items()
+        ],
+    }
+
+
+@router.get("/currency-rates", response_model=CurrencyRatesResponse)
+async def get_currency_rates():
+    """Get the currency rate snapshot this worker is serving"""
+    return _snapshot_response(get_currency_snapshot())
+
+
+@router.put("/currency-rates", response_model=CurrencyRatesResponse)
+async def publish_currency_rates(
+    update: CurrencyRatesUpdate,
+    background_tasks: BackgroundTasks,
+    recompute: bool = True,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Replace all currency references and publish them as a new version.
+    This worker switches immediately; other workers pick the version up on
+    their next poll (CURRENCY_RATES_REFRESH_SECONDS).
+
+    With recompute (default), template amounts derived from a changed rate are
+    rewritten in the background; follow it at /currency-rates/recompute/{version}
+    on the same worker.
+    """
+    currencies = [rate.currency.upper() for rate in update.rates]
+    if not currencies:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="At least one currency is required")
+    if len(set(currencies)) != len(currencies):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate currency in rates")
+    invalid = [rate.currency for rate in update.rates if rate.eur_rate <= 0]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"eur_rate must be positive: {', '.join(invalid)}")
+
+    try:
+        # Rows and version are committed together, so a worker never sees
+        # a version without its rates
+        previous = {
+            ref.currency: ref.eur_rate
+            for ref in (await db.scalars(select(CurrencyReference))).all()
+        }
+        await db.execute(delete(CurrencyReference))
+        db.add_all([
+            CurrencyReference(currency=currency, eur_rate=rate.eur_rate,
+                              min_deposit=rate.min_deposit, max_deposit=rate.max_deposit)
+            for currency, rate in zip(currencies, update.rates)
+        ])
+        version = CurrencyReferenceVersion()
+        db.add(version)
+        await db.flush()
+        version_id = version.id
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to publish currency rates: {str(e)}"
+        )
+
+    snapshot = CurrencySnapshot.build(version_id, {
+        currency: {"rate": rate.eur_rate, "min_deposit": rate.min_deposit, "max_deposit": rate.max_deposit}
+        for currency, rate in zip(currencies, update.rates)
+    })
+    install_currency_snapshot(snapshot)
+
+    changes = changed_rates(previous, {c: r["rate"] for c, r in snapshot.rates.items()})
+    if recompute and changes:
+        progress = RecomputeProgress(version=version_id, currencies=sorted(changes))
+        track_job(progress)
+        background_tasks.add_task(recompute_converted_amounts, changes, progress)
+
+    return _snapshot_response(get_currency_snapshot())
+
+
+@router.get("/currency-rates/recompute/{version}")
+async def get_recompute_progress(version: int):
+    """Progress of the template recompute started by publishing a rate version on this worker"""
+    progress = recompute_jobs.get(version)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No recompute for version {version} on this worker"
+        )
+    return progress.as_dict()
+
+
+@router.post("/currency-rates/reload", response_model=CurrencyRatesResponse)
+async def reload_currency_rates():
+    """Reload this worker's snapshot from the database, e.g. after editing rates directly"""
+    snapshot = await run_in_threadpool(refresh_currency_snapshot, True)
+    return _snapshot_response(snapshot)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from database.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_db, get_read_db
 from database.models import CustomLanguage
 from pydantic import BaseModel
 
@@ -16,18 +17,18 @@ class CustomLanguageSchema(BaseModel):
 
 
 @router.get("/custom-languages")
-def get_custom_languages(db: Session = Depends(get_db)):
+async def get_custom_languages(db: AsyncSession = Depends(get_read_db)):
     """Get all custom languages"""
-    languages = db.query(CustomLanguage).all()
+    languages = (await db.scalars(select(CustomLanguage))).all()
     return [{"code": lang.code, "name": lang.name, "isCustom": True} for lang in languages]
 
 
 @router.post("/custom-languages")
-def create_custom_language(language: CustomLanguageSchema, db: Session = Depends(get_db)):
+async def create_custom_language(language: CustomLanguageSchema, db: AsyncSession = Depends(get_db)):
     """Create a new custom language"""
     # Check if language already exists
-    existing = db.query(CustomLanguage).filter(
-        CustomLanguage.code == language.code.lower()).first()
+    existing = await db.scalar(select(CustomLanguage).where(
+        CustomLanguage.code == language.code.lower()))
     if existing:
         raise HTTPException(
             status_code=400, detail="Language code already exists")
@@ -35,21 +36,21 @@ def create_custom_language(language: CustomLanguageSchema, db: Session = Depends
     new_language = CustomLanguage(
         code=language.code.lower(), name=language.name)
     db.add(new_language)
-    db.commit()
-    db.refresh(new_language)
+    await db.commit()
+    await db.refresh(new_language)
 
     return {"code": new_language.code, "name": new_language.name, "isCustom": True}
 
 
 @router.delete("/custom-languages/{code}")
-def delete_custom_language(code: str, db: Session = Depends(get_db)):
+async def delete_custom_language(code: str, db: AsyncSession = Depends(get_db)):
     """Delete a custom language"""
-    language = db.query(CustomLanguage).filter(
-        CustomLanguage.code == code.lower()).first()
+    language = await db.scalar(select(CustomLanguage).where(
+        CustomLanguage.code == code.lower()))
     if not language:
         raise HTTPException(status_code=404, detail="Language not found")
 
-    db.delete(language)
-    db.commit()
+    await db.delete(language)
+    await db.commit()
 
     return {"message": f"Language {code} deleted successfully"}
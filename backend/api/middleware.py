@@ -0,0 +1,114 @@
+"""
+ASGI middleware for request timing and metrics, and read-your-writes routing.
+"""
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from database.database import READ_STICKY_COOKIE, READ_STICKY_SECONDS, mark_write
+from services.logging_config import ACCESS_LOGGER
+from services.metrics import finish_request, metrics, start_request
+
+access_logger = logging.getLogger(ACCESS_LOGGER)
+
+# endpoint function -> route path, filled on first use
+_route_paths = {}
+
+
+def route_template(scope) -> Optional[str]:
+    """Return the matched route path ("/api/bonus-templates/{template_id}"), or None if no route matched"""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+
+    # Starlette < 0.33 only records the endpoint; map it back to its route
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is not None and app is not None:
+        if endpoint not in _route_paths:
+            for candidate in app.router.routes:
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    _route_paths[endpoint] = candidate.path
+                    break
+        if endpoint in _route_paths:
+            return _route_paths[endpoint]
+    return None
+
+
+class RequestTimingMiddleware:
+    """
+    Measures each HTTP request from arrival until the last body chunk is sent,
+    records it in the metrics registry together with the SQL statements it ran,
+    and writes one JSON line per request to the access logger (when enabled).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        sql_stats, token = start_request()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish_request(token)
+            duration = time.perf_counter() - started
+            route = route_template(scope)
+            metrics.observe_request(
+                scope["method"], route, status_code, duration, sql_stats)
+            if access_logger.isEnabledFor(logging.INFO):
+                access_logger.info("%s", json.dumps({
+                    "ts": datetime.now(timezone.utc).isoformat(),
+                    "method": scope["method"],
+                    "route": route,
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                    "sql_count": sql_stats.count,
+                    "sql_ms": round(sql_stats.seconds * 1000, 2),
+                }))
+
+
+# Requests that may write; the others never move reads to the primary
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful write request, keeps reads on the primary for
+    READ_STICKY_SECONDS: for this worker (database.mark_write) and, through a
+    cookie, for the client on every worker. Only installed with a read replica.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = mark_write()
+                cookie = (f"{READ_STICKY_COOKIE}={until:.3f}; Max-Age={max(1, round(READ_STICKY_SECONDS))}; "
+                          "Path=/; HttpOnly; SameSite=Lax")
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
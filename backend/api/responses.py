@@ -0,0 +1,42 @@
+"""
+Response helpers for pre-serialized JSON bodies.
+"""
+
+from typing import Dict, Optional
+
+from fastapi import Response
+
+from services.json_bodies import GZIP_MINIMUM_SIZE
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip (or any coding) with q > 0"""
+    if not accept_encoding:
+        return False
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        name, _, value = params.partition("=")
+        if name.strip().lower() != "q":
+            return True
+        try:
+            return float(value) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def cached_json_response(entry, accept_encoding: Optional[str],
+                         headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Send a cache entry's pre-serialized body (entry.body / entry.gzip_body)
+    as-is: gzipped when the client accepts it and the body is large enough.
+    """
+    headers = dict(headers or {})
+    if len(entry.body) >= GZIP_MINIMUM_SIZE:
+        headers["Vary"] = "Accept-Encoding"
+        if accepts_gzip(accept_encoding):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=entry.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
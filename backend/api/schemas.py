@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
 
@@ -24,6 +24,7 @@ class StableConfigCreate(BaseModel):
 class StableConfigResponse(StableConfigCreate):
     """Schema for stable config responses"""
     id: int
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -31,6 +32,43 @@ class StableConfigResponse(StableConfigCreate):
         from_attributes = True
 
 
+class StableConfigPatchOperation(BaseModel):
+    """One JSON-patch style operation on a pricing table or cell"""
+    op: Literal["add", "replace", "remove"]
+    path: str  # "/cost/1", "/cost/1/name" or "/cost/1/values/EUR"
+    value: Optional[Any] = None
+
+
+class StableConfigPatch(BaseModel):
+    """Schema for a partial stable config update"""
+    version: int  # version the edits were made against
+    operations: List[StableConfigPatchOperation]
+
+
+class StableConfigPatchResponse(BaseModel):
+    """Updated fragment of a patched stable config: only the touched fields"""
+    provider: str
+    version: int
+    updated_at: datetime
+    tables: Dict[str, List[CurrencyTable]]
+
+
+class PricingValueResponse(BaseModel):
+    """Schema for one resolved pricing table value"""
+    provider: str
+    field: str
+    table: str
+    currency: str
+    value: float
+
+
+class PricingValuesResponse(BaseModel):
+    """Schema for a batch of resolved pricing table values"""
+    provider: str
+    # {"field:table:currency": value}, null where the table or currency is missing
+    values: Dict[str, Optional[float]]
+
+
 class BonusTemplateCreate(BaseModel):
     """Schema for creating a new bonus template"""
     id: str  # e.g., "Black Friday: Casino Reload 200% up to €300 21.11.25"
@@ -98,6 +136,44 @@ class BonusTranslationResponse(BonusTranslationCreate):
         from_attributes = True
 
 
+class BulkTranslationItem(BaseModel):
+    """Schema for one language entry in a bulk translation save"""
+    currency: Optional[str] = None
+    name: str
+    description: Optional[str] = None
+
+
+class BulkTranslationsRequest(BaseModel):
+    """Schema for saving translations of one or many templates at once"""
+    # {template_id: {language: {name, description, currency}}}
+    # language may be a base code ("en") or a currency variant ("GBP_en")
+    translations: Dict[str, Dict[str, BulkTranslationItem]]
+
+
+class BulkTranslationsResponse(BaseModel):
+    """Per-template, per-language outcome of a bulk translation save"""
+    # {template_id: {language: "created" | "updated" | "template_not_found"}}
+    results: Dict[str, Dict[str, str]]
+    created: int
+    updated: int
+
+
+class BulkSimpleTemplateResult(BaseModel):
+    """Outcome of one payload of a bulk simple-format create"""
+    id: Optional[str] = None
+    # "created" | "invalid" | "duplicate" | "exists" | "not_created"
+    status: str
+    json_output: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class BulkSimpleTemplatesResponse(BaseModel):
+    """Per-payload results of a bulk simple-format create, in request order"""
+    results: List[BulkSimpleTemplateResult]
+    created: int
+    failed: int
+
+
 class CurrencyReferenceCreate(BaseModel):
     """Schema for currency reference"""
     currency: str
@@ -116,6 +192,17 @@ class CurrencyReferenceResponse(CurrencyReferenceCreate):
         from_attributes = True
 
 
+class CurrencyRatesUpdate(BaseModel):
+    """Schema for publishing a complete new set of currency references"""
+    rates: List[CurrencyReferenceCreate]
+
+
+class CurrencyRatesResponse(BaseModel):
+    """Schema for the currency rate snapshot served by a worker"""
+    version: int
+    rates: List[CurrencyReferenceCreate]
+
+
 class BonusJSONOutput(BaseModel):
     """Schema for the final JSON output matching config.json structure"""
     id: str
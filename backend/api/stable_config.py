@@ -1,16 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple, Union
 
-from database.database import get_db
+from database.database import get_db, get_read_db
 from database.models import StableConfig
-from api.schemas import StableConfigCreate, StableConfigResponse
+from api.responses import cached_json_response
+from api.schemas import StableConfigCreate, StableConfigResponse, StableConfigPatch, StableConfigPatchResponse, PricingValueResponse, PricingValuesResponse
+from services.render_cache import render_cache
+from services.stable_config_patch import PatchError, apply_patch
+from services.stable_config_cache import PRICING_FIELDS, get_all_provider_configs, get_provider_config, stable_config_cache
 
 router = APIRouter()
 
 
 @router.post("/stable-config", response_model=StableConfigResponse)
-def save_stable_config(config: StableConfigCreate, db: Session = Depends(get_db)):
+async def save_stable_config(config: StableConfigCreate, db: AsyncSession = Depends(get_db)):
     """
     Save or update stable configuration for a provider.
     Creates new record if provider doesn't exist, otherwise updates existing.
@@ -28,9 +34,9 @@ def save_stable_config(config: StableConfigCreate, db: Session = Depends(get_db)
                 ]
 
         # Check if config exists for this provider
-        existing_config = db.query(StableConfig).filter(
+        existing_config = (await db.scalars(select(StableConfig).where(
             StableConfig.provider == config.provider
-        ).first()
+        ))).first()
 
         if existing_config:
             # Update existing
@@ -40,8 +46,11 @@ def save_stable_config(config: StableConfigCreate, db: Session = Depends(get_db)
             existing_config.minimum_stake_to_wager = config_data['minimum_stake_to_wager']
             existing_config.maximum_stake_to_wager = config_data['maximum_stake_to_wager']
             existing_config.maximum_withdraw = config_data['maximum_withdraw']
-            db.commit()
-            db.refresh(existing_config)
+            await db.commit()
+            # Stable config first, so a render that starts after this sees the new config
+            stable_config_cache.invalidate(config.provider)
+            render_cache.invalidate_provider(config.provider)
+            await db.refresh(existing_config)
             return existing_config
         else:
             # Create new
@@ -55,36 +64,146 @@ def save_stable_config(config: StableConfigCreate, db: Session = Depends(get_db)
                 maximum_withdraw=config_data['maximum_withdraw']
             )
             db.add(new_config)
-            db.commit()
-            db.refresh(new_config)
+            await db.commit()
+            stable_config_cache.invalidate(config.provider)
+            render_cache.invalidate_provider(config.provider)
+            await db.refresh(new_config)
             return new_config
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500, detail=f"Error saving config: {str(e)}")
 
 
+@router.patch("/stable-config/{provider}", response_model=StableConfigPatchResponse)
+async def patch_stable_config(provider: str, patch: StableConfigPatch, db: AsyncSession = Depends(get_db)):
+    """
+    Apply JSON-patch style edits to a provider's pricing tables.
+    Only the fields touched by the operations are written. The request must
+    carry the version it was based on; a stale version gets 409 Conflict.
+    Returns only the updated fields.
+    """
+    config = (await db.scalars(select(StableConfig).where(
+        StableConfig.provider == provider.upper()
+    ).order_by(StableConfig.id))).first()
+
+    if not config:
+        raise HTTPException(
+            status_code=404, detail=f"Config not found for provider: {provider}")
+    if config.version != patch.version:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Config was modified (version {config.version}, expected {patch.version})")
+
+    try:
+        operations = [op.dict() for op in patch.operations]
+        updated = apply_patch(
+            {field: getattr(config, field) for field in PRICING_FIELDS}, operations)
+    except PatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    for field, tables in updated.items():
+        setattr(config, field, tables)
+
+    try:
+        # The version check in the UPDATE catches writes since the read above
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Config was modified concurrently, reload and retry")
+
+    stable_config_cache.invalidate(config.provider)
+    render_cache.invalidate_provider(config.provider)
+
+    return {
+        "provider": config.provider,
+        "version": config.version,
+        "updated_at": config.updated_at,
+        "tables": updated,
+    }
+
+
 @router.get("/stable-config/{provider}", response_model=StableConfigResponse)
-def get_stable_config(provider: str, db: Session = Depends(get_db)):
+async def get_stable_config(provider: str, accept_encoding: Optional[str] = Header(None), db: AsyncSession = Depends(get_read_db)):
     """
     Retrieve stable configuration for a specific provider.
+    Served from the stable config cache as pre-serialized (and pre-gzipped) JSON.
     """
-    config = db.query(StableConfig).filter(
-        StableConfig.provider == provider.upper()
-    ).first()
+    config = await get_provider_config(db, provider.upper())
 
     if not config:
         raise HTTPException(
             status_code=404, detail=f"Config not found for provider: {provider}")
 
-    return config
+    return cached_json_response(config, accept_encoding)
 
 
 @router.get("/stable-config", response_model=List[StableConfigResponse])
-def get_all_stable_configs(db: Session = Depends(get_db)):
+async def get_all_stable_configs(db: AsyncSession = Depends(get_read_db)):
     """
     Retrieve all stable configurations.
     """
-    configs = db.query(StableConfig).all()
-    return configs
+    configs = await get_all_provider_configs(db)
+    return Response(content=b"[" + b",".join(c.body for c in configs) + b"]",
+                    media_type="application/json")
+
+
+def _parse_lookup(lookup: str) -> Tuple[str, str, str]:
+    """Split "field:table:currency"; the table id may itself contain ':'"""
+    field, sep, rest = lookup.partition(":")
+    table, sep2, currency = rest.rpartition(":")
+    if not sep or not sep2:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid lookup '{lookup}', expected field:table:currency")
+    return field, table, currency
+
+
+def _check_field(field: str) -> None:
+    if field not in PRICING_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown pricing field '{field}'. Use one of: {', '.join(PRICING_FIELDS)}")
+
+
+@router.get("/stable-config/{provider}/resolve",
+            response_model=Union[PricingValueResponse, PricingValuesResponse])
+async def resolve_pricing(
+    provider: str,
+    field: Optional[str] = None,
+    table: Optional[str] = None,
+    currency: Optional[str] = None,
+    lookup: List[str] = Query([]),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Resolve pricing table values without downloading the whole config.
+    Either one value (field, table, currency) or a batch of repeated
+    lookup=field:table:currency parameters; each lookup is a hash lookup
+    in the cached, pre-parsed config.
+    """
+    config = await get_provider_config(db, provider.upper())
+    if not config:
+        raise HTTPException(
+            status_code=404, detail=f"Config not found for provider: {provider}")
+
+    if lookup:
+        values = {}
+        for item in lookup:
+            item_field, item_table, item_currency = _parse_lookup(item)
+            _check_field(item_field)
+            values[item] = config.value(item_field, item_table, item_currency)
+        return {"provider": config.provider, "values": values}
+
+    if not (field and table and currency):
+        raise HTTPException(
+            status_code=400, detail="Pass field, table and currency, or one or more lookup parameters")
+    _check_field(field)
+    value = config.value(field, table, currency)
+    if value is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No {field} value for table '{table}' and currency {currency}")
+    return {"provider": config.provider, "field": field, "table": table,
+            "currency": currency, "value": value}
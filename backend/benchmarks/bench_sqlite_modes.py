@@ -0,0 +1,140 @@
+"""
+Benchmark - SQLite development mode (StaticPool) vs production mode (WAL + pool).
+
+Starts the API twice with uvicorn (SQLITE_MODE=development, then production)
+against the same seeded SQLite database and runs a mixed workload for a fixed
+time: readers on the rendered JSON and list endpoints, writers upserting
+translations, and one client downloading the full NDJSON export in a loop.
+Prints throughput and latency percentiles of reads and writes for each mode.
+
+Requires httpx (pip install httpx). Run from the backend directory:
+    python -m benchmarks.bench_sqlite_modes --templates 5000 --readers 48 --writers 8 --seconds 15
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_db_modes import BACKEND_DIR, seed_database, start_server, wait_until_ready
+
+MODES = ("development", "production")
+
+
+def _summary(latencies, elapsed: float):
+    if not latencies:
+        return {"rps": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+    }
+
+
+async def run_mixed_load(base_url: str, templates: int, readers: int, writers: int,
+                         seconds: float, export: bool):
+    import httpx
+
+    read_latencies, write_latencies = [], []
+    errors = 0
+    exports = export_errors = 0
+    deadline = 0.0
+
+    limits = httpx.Limits(max_connections=readers + writers + 1,
+                          max_keepalive_connections=readers + writers + 1)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        await wait_until_ready(client, base_url)
+        rng = random.Random(0)
+
+        async def timed(latencies, request):
+            nonlocal errors
+            started = time.perf_counter()
+            try:
+                response = await request
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+        async def reader():
+            while time.monotonic() < deadline:
+                i = rng.randrange(templates)
+                path = (f"/api/bonus-templates/BENCH_{i:06d}/json" if i % 4
+                        else "/api/bonus-templates?limit=50")
+                await timed(read_latencies, client.get(base_url + path))
+
+        async def writer():
+            while time.monotonic() < deadline:
+                i = rng.randrange(templates)
+                await timed(write_latencies, client.post(
+                    f"{base_url}/api/bonus-templates/BENCH_{i:06d}/translations",
+                    json={"language": "it", "name": f"Bonus {i} it {time.time()}"}))
+
+        async def exporter():
+            nonlocal exports, export_errors
+            while time.monotonic() < deadline:
+                try:
+                    async with client.stream("GET", f"{base_url}/api/bonus-templates/export") as response:
+                        async for _ in response.aiter_bytes():
+                            pass
+                    exports += 1
+                except httpx.HTTPError:
+                    # A broken stream means the export failed on the server
+                    export_errors += 1
+
+        deadline = time.monotonic() + seconds
+        started = time.perf_counter()
+        tasks = [reader() for _ in range(readers)] + [writer() for _ in range(writers)]
+        if export:
+            tasks.append(exporter())
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "reads": _summary(read_latencies, elapsed),
+        "writes": _summary(write_latencies, elapsed),
+        "exports": exports,
+        "export_errors": export_errors,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--templates", type=int, default=5000)
+    parser.add_argument("--readers", type=int, default=48)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--no-export", action="store_true", help="Skip the concurrent export client")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    seed_database(database_url, args.templates)
+
+    print(f"{args.seconds:g}s, {args.readers} readers, {args.writers} writers, "
+          f"{'one' if not args.no_export else 'no'} exporter, {args.templates} templates")
+    for mode in MODES:
+        server = start_server(database_url, False, args.port, SQLITE_MODE=mode)
+        try:
+            result = asyncio.run(run_mixed_load(
+                f"http://127.0.0.1:{args.port}", args.templates, args.readers,
+                args.writers, args.seconds, not args.no_export))
+        finally:
+            server.terminate()
+            server.wait()
+        reads, writes = result["reads"], result["writes"]
+        print(f"  {mode:<11}  reads {reads['rps']:7.1f}/s p50 {reads['p50_ms']:7.1f} ms p95 {reads['p95_ms']:7.1f} ms"
+              f"   writes {writes['rps']:6.1f}/s p50 {writes['p50_ms']:7.1f} ms p95 {writes['p95_ms']:7.1f} ms"
+              f"   exports {result['exports']} ({result['export_errors']} failed)   errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
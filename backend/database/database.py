@@ -1,38 +1,518 @@
-from sqlalchemy import create_engine
+from sqlalchemy import CursorResult, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from typing import Optional
+import logging
 import os
+import time
+import uuid
 from dotenv import load_dotenv
 
+from services.metrics import instrument_engine
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./casino_crm.db")
 
-# SQLite config for development
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL,
+# Serve requests through the async engine (aiosqlite / asyncpg) or keep the
+# blocking driver and pool. Defaults to async on PostgreSQL only: aiosqlite
+# funnels every query through one connection thread and benchmarks slower
+# (see benchmarks/bench_db_modes.py).
+DATABASE_ASYNC = os.getenv(
+    "DATABASE_ASYNC", "false" if DATABASE_URL.startswith("sqlite") else "true"
+).lower() in ("1", "true", "yes")
+
+# SQLite engine mode:
+#   development - one shared connection (StaticPool); every request serializes on it
+#   production  - a pool of connections in WAL mode, so readers run in parallel
+#                 with the single writer (see benchmarks/bench_sqlite_modes.py)
+SQLITE_MODE = os.getenv("SQLITE_MODE", "development").lower()
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "10"))
+SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "20"))
+# Applied to every new connection in production mode
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    # Wait for the write lock instead of failing with "database is locked"
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    # Durable across application crashes; only a power loss can drop the last commits
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    # Negative: size in KiB, per connection
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024))),
+    "temp_store": "MEMORY",
+}
+
+
+def sqlite_pooled(url: str) -> bool:
+    """Whether a SQLite URL gets the production pool (in-memory databases cannot be shared)"""
+    return SQLITE_MODE == "production" and ":memory:" not in url and url.rstrip("/") not in ("sqlite:", "sqlite+aiosqlite:")
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record=None):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+# PostgreSQL pool settings, for the primary and the read replica. pre_ping
+# replaces connections closed behind the pool's back (PgBouncer
+# server_idle_timeout, failovers); recycle retires them before such timeouts.
+PG_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+PG_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
+PG_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", "300"))
+# PgBouncer in transaction pooling mode runs consecutive statements on different
+# server connections, which breaks asyncpg's named prepared statements
+DATABASE_PGBOUNCER = os.getenv("DATABASE_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+
+
+def pg_engine_options(async_driver: bool = False) -> dict:
+    options = {
+        "pool_size": PG_POOL_SIZE,
+        "max_overflow": PG_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": PG_POOL_RECYCLE,
+    }
+    if async_driver and DATABASE_PGBOUNCER:
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # Unique names, so a statement never collides with one left on the server connection
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return options
+
+
+def make_engine(url: str):
+    """Blocking engine for a DATABASE_URL"""
+    if not url.startswith("sqlite"):
+        # PostgreSQL config for production
+        return create_engine(url, **pg_engine_options())
+    if sqlite_pooled(url):
+        sqlite_engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            pool_size=SQLITE_POOL_SIZE,
+            max_overflow=SQLITE_MAX_OVERFLOW,
+        )
+        event.listen(sqlite_engine, "connect", set_sqlite_pragmas)
+        return sqlite_engine
+    # SQLite config for development
+    return create_engine(
+        url,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-else:
-    # PostgreSQL config for production
-    engine = create_engine(DATABASE_URL, pool_size=10, max_overflow=20)
 
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def make_async_engine(url: str):
+    """Async engine (aiosqlite / asyncpg) for a sync DATABASE_URL"""
+    if not url.startswith("sqlite"):
+        return create_async_engine(to_async_url(url), **pg_engine_options(async_driver=True))
+    if sqlite_pooled(url):
+        # aiosqlite defaults to NullPool (a new connection and thread per checkout)
+        sqlite_engine = create_async_engine(
+            to_async_url(url),
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=SQLITE_POOL_SIZE,
+            max_overflow=SQLITE_MAX_OVERFLOW,
+        )
+        event.listen(sqlite_engine.sync_engine, "connect", set_sqlite_pragmas)
+        return sqlite_engine
+    return create_async_engine(to_async_url(url), poolclass=StaticPool)
+
+
+engine = make_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine, "sync")
 
+async_engine = None
+AsyncSessionLocal = None
+
+if DATABASE_ASYNC:
+    async_engine = make_async_engine(DATABASE_URL)
+    # expire_on_commit=False: attributes must stay readable after commit
+    # without an implicit (blocking) refresh
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    instrument_engine(async_engine.sync_engine, "async")
+
+# Optional read replica (e.g. a PostgreSQL streaming standby) for the GET
+# endpoints and exports. Without it the read sessions use the primary.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or None
+# After a write, the writing client (cookie) and the worker that handled it
+# read from the primary for this long, covering the replica's lag
+READ_STICKY_SECONDS = float(os.getenv("DATABASE_READ_STICKY_SECONDS", "3"))
+READ_STICKY_COOKIE = "crm_read_primary"
+
+read_engine = engine
+ReadSessionLocal = SessionLocal
+async_read_engine = async_engine
+AsyncReadSessionLocal = AsyncSessionLocal
+
+if DATABASE_READ_URL:
+    read_engine = make_engine(DATABASE_READ_URL)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    instrument_engine(read_engine, "sync_read")
+    if DATABASE_ASYNC:
+        async_read_engine = make_async_engine(DATABASE_READ_URL)
+        AsyncReadSessionLocal = async_sessionmaker(
+            async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        instrument_engine(async_read_engine.sync_engine, "async_read")
+
+# time.monotonic() until which this worker reads from the primary
+_primary_reads_until = 0.0
+
+
+def mark_write() -> float:
+    """
+    Record a committed write: this worker reads from the primary for the next
+    READ_STICKY_SECONDS. Returns the wall-clock time the window ends, for the cookie.
+    """
+    global _primary_reads_until
+    _primary_reads_until = time.monotonic() + READ_STICKY_SECONDS
+    return time.time() + READ_STICKY_SECONDS
+
+
+def read_from_primary(request: Optional[Request] = None) -> bool:
+    """Whether reads for this request must see the latest writes"""
+    if not DATABASE_READ_URL:
+        return True
+    if time.monotonic() < _primary_reads_until:
+        return True
+    if request is not None:
+        try:
+            return float(request.cookies.get(READ_STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+    return False
+
+
+def read_sessionmaker(request: Optional[Request] = None):
+    """Blocking sessionmaker for reads: the replica, or the primary within the sticky window"""
+    return SessionLocal if read_from_primary(request) else ReadSessionLocal
+
+
+class SyncSessionAdapter:
+    """
+    Exposes a blocking Session through the awaitable AsyncSession methods the
+    routers use, running each call in the threadpool. Used when DATABASE_ASYNC
+    is off so the routers have a single implementation.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    def get_bind(self):
+        return self.sync_session.get_bind()
+
+    def _buffered_execute(self, statement, params):
+        # Fetch (and hydrate) every row here in the worker thread, so the
+        # .all() / .first() / .mappings() the routers call afterwards on the
+        # event loop only read from memory
+        result = self.sync_session.execute(statement, params)
+        if isinstance(result, CursorResult) and not result.returns_rows:
+            # UPDATE / DELETE without RETURNING: nothing to fetch, keep rowcount
+            return result
+        return result.freeze()()
+
+    async def execute(self, statement, params=None):
+        return await run_in_threadpool(self._buffered_execute, statement, params)
+
+    async def scalar(self, statement, params=None):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params)
+
+    async def scalars(self, statement, params=None):
+        result = await run_in_threadpool(self._buffered_execute, statement, params)
+        return result.scalars()
+
+    async def get(self, entity, ident):
+        return await run_in_threadpool(self.sync_session.get, entity, ident)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def refresh(self, instance):
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+
+async def get_db():
+    if DATABASE_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SyncSessionAdapter(SessionLocal(expire_on_commit=False))
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only endpoints: the read replica when DATABASE_READ_URL is
+    set, except within READ_STICKY_SECONDS of a write (see mark_write).
+    """
+    if read_from_primary(request):
+        async for db in get_db():
+            yield db
+    elif DATABASE_ASYNC:
+        async with AsyncReadSessionLocal() as db:
+            yield db
+    else:
+        db = SyncSessionAdapter(ReadSessionLocal(expire_on_commit=False))
+        try:
+            yield db
+        finally:
+            await db.close()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
 # Initialize database
 
 
 def init_db():
     from database.models import Base
+    from services.currency_service import refresh_currency_snapshot, seed_currency_references
+    from services.search_index import ensure_search_index
+    backfill_template_created_at()
+    migrate_template_keys()
     Base.metadata.create_all(bind=engine)
-    print("✅ Database initialized")
+    ensure_columns()
+    ensure_indexes()
+    ensure_search_index(engine)
+    with SessionLocal() as db:
+        seed_currency_references(db)
+    refresh_currency_snapshot(force=True)
+    logger.info("✅ Database initialized")
+
+
+def ensure_columns():
+    """
+    Add columns declared on models that are missing from an existing database.
+    create_all() only creates columns together with new tables, so new columns
+    must be nullable or have a server default.
+    """
+    from sqlalchemy import inspect, text
+    from database.models import Base
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    ddl += f" DEFAULT {getattr(default, 'text', default)}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                conn.execute(text(ddl))
+                logger.info("Added column %s.%s", table.name, column.name)
+
+
+def backfill_template_created_at():
+    """
+    Give legacy templates without a created_at one (their updated_at, else now).
+    Template listings page on (created_at, id), which cannot encode or reach a
+    NULL created_at, and the SQLite key migration copies into a NOT NULL column.
+    """
+    from datetime import datetime
+    from sqlalchemy import inspect, text
+    if "bonus_templates" not in inspect(engine).get_table_names():
+        return
+    with engine.begin() as conn:
+        filled = conn.execute(text(
+            "UPDATE bonus_templates SET created_at = COALESCE(updated_at, :now) "
+            "WHERE created_at IS NULL"), {"now": datetime.utcnow()}).rowcount
+    if filled:
+        logger.info("Backfilled created_at of %d templates", filled)
+
+
+def ensure_indexes():
+    """
+    Create indexes declared on models that are missing from an existing database.
+    create_all() only creates indexes together with new tables.
+    """
+    from database.models import Base
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+# Keeps the most recently updated translation per (template, language)
+_LATEST_TRANSLATION_FIRST = "ORDER BY (tr.updated_at IS NULL), tr.updated_at DESC, tr.id DESC"
+
+
+def migrate_template_keys():
+    """
+    Move a database created before the surrogate key onto it: bonus_templates
+    gets an integer pk primary key (id stays, unique) and bonus_translations
+    references it through template_pk instead of the template_id string.
+    Translations of missing templates and duplicate (template, language) rows
+    are dropped on the way. Runs in one transaction; a no-op once migrated.
+    """
+    from sqlalchemy import inspect
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    if "bonus_templates" not in tables or "bonus_translations" not in tables:
+        return
+    if "pk" in {c["name"] for c in inspector.get_columns("bonus_templates")}:
+        return
+
+    logger.info("Migrating bonus_templates to an integer primary key...")
+    if engine.dialect.name == "sqlite":
+        _migrate_template_keys_sqlite(inspector)
+    elif engine.dialect.name == "postgresql":
+        _migrate_template_keys_postgresql(inspector)
+    else:
+        raise NotImplementedError(
+            f"Template key migration is not supported on {engine.dialect.name}")
+    logger.info("✅ bonus_templates migrated to an integer primary key")
+
+
+def _migrate_template_keys_sqlite(inspector):
+    # SQLite cannot change a primary key in place: rebuild both tables
+    from sqlalchemy.schema import CreateIndex, CreateTable
+    from database.models import BonusTemplate, BonusTranslation
+    from services.search_index import FTS_TABLE
+
+    templates, translations = BonusTemplate.__table__, BonusTranslation.__table__
+    template_columns = [c.name for c in templates.columns
+                        if c.name in {col["name"] for col in inspector.get_columns("bonus_templates")}]
+    translation_columns = [c.name for c in translations.columns if c.name != "template_pk" and c.name in {
+        col["name"] for col in inspector.get_columns("bonus_translations")}]
+
+    raw = engine.raw_connection()
+    connection = raw.driver_connection
+    isolation_level = connection.isolation_level
+    # Manage the transaction explicitly: sqlite3 would run the DDL outside of one
+    connection.isolation_level = None
+    cursor = connection.cursor()
+    try:
+        cursor.execute("BEGIN")
+        # The FTS triggers and old indexes would follow the renamed tables;
+        # ensure_search_index recreates and refills the search index afterwards
+        for kind, name in cursor.execute(
+            "SELECT type, name FROM sqlite_master WHERE type IN ('trigger', 'index') "
+            "AND tbl_name IN ('bonus_templates', 'bonus_translations') AND sql IS NOT NULL"
+        ).fetchall():
+            cursor.execute(f'DROP {kind.upper()} "{name}"')
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        cursor.execute("ALTER TABLE bonus_templates RENAME TO bonus_templates_old")
+        cursor.execute("ALTER TABLE bonus_translations RENAME TO bonus_translations_old")
+
+        for table in (templates, translations):
+            cursor.execute(str(CreateTable(table).compile(dialect=engine.dialect)))
+            for index in table.indexes:
+                cursor.execute(str(CreateIndex(index).compile(dialect=engine.dialect)))
+
+        # pk values follow creation order
+        columns = ", ".join(template_columns)
+        cursor.execute(
+            f"INSERT INTO bonus_templates ({columns}) "
+            f"SELECT {columns} FROM bonus_templates_old ORDER BY created_at, id")
+        columns = ", ".join(translation_columns)
+        cursor.execute(
+            f"INSERT INTO bonus_translations (template_pk, {columns}) "
+            f"SELECT template_pk, {columns} FROM ("
+            f"SELECT t.pk AS template_pk, {', '.join('tr.' + c for c in translation_columns)}, "
+            f"ROW_NUMBER() OVER (PARTITION BY t.pk, tr.language {_LATEST_TRANSLATION_FIRST}) AS rn "
+            f"FROM bonus_translations_old tr JOIN bonus_templates t ON t.id = tr.template_id"
+            f") ranked WHERE rn = 1")
+        dropped = cursor.execute("SELECT COUNT(*) FROM bonus_translations_old").fetchone()[0] \
+            - cursor.execute("SELECT COUNT(*) FROM bonus_translations").fetchone()[0]
+
+        cursor.execute("DROP TABLE bonus_translations_old")
+        cursor.execute("DROP TABLE bonus_templates_old")
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        cursor.close()
+        connection.isolation_level = isolation_level
+        raw.close()
+    if dropped:
+        logger.info("Dropped %d orphaned or duplicate translations", dropped)
+
+
+def _migrate_template_keys_postgresql(inspector):
+    from sqlalchemy import text
+    foreign_keys = [fk["name"] for fk in inspector.get_foreign_keys("bonus_translations")
+                    if fk["referred_table"] == "bonus_templates"]
+    primary_key = inspector.get_pk_constraint("bonus_templates")["name"]
+
+    with engine.begin() as conn:
+        for name in foreign_keys:
+            conn.execute(text(f'ALTER TABLE bonus_translations DROP CONSTRAINT "{name}"'))
+
+        # SERIAL numbers the existing rows
+        conn.execute(text("ALTER TABLE bonus_templates ADD COLUMN pk SERIAL"))
+        conn.execute(text(f'ALTER TABLE bonus_templates DROP CONSTRAINT "{primary_key}"'))
+        conn.execute(text("ALTER TABLE bonus_templates ADD PRIMARY KEY (pk)"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_bonus_templates_id"))
+        conn.execute(text("CREATE UNIQUE INDEX ix_bonus_templates_id ON bonus_templates (id)"))
+
+        conn.execute(text("ALTER TABLE bonus_translations ADD COLUMN template_pk INTEGER"))
+        conn.execute(text(
+            "UPDATE bonus_translations tr SET template_pk = t.pk "
+            "FROM bonus_templates t WHERE t.id = tr.template_id"))
+        dropped = conn.execute(text(
+            "DELETE FROM bonus_translations WHERE template_pk IS NULL")).rowcount
+        dropped += conn.execute(text(
+            "DELETE FROM bonus_translations WHERE id IN ("
+            "SELECT id FROM (SELECT tr.id, ROW_NUMBER() OVER ("
+            f"PARTITION BY tr.template_pk, tr.language {_LATEST_TRANSLATION_FIRST}) AS rn "
+            "FROM bonus_translations tr) ranked WHERE rn > 1)"
+        )).rowcount
+
+        conn.execute(text("DROP INDEX IF EXISTS uq_bonus_translations_template_language"))
+        conn.execute(text("ALTER TABLE bonus_translations DROP COLUMN template_id"))
+        conn.execute(text("ALTER TABLE bonus_translations ALTER COLUMN template_pk SET NOT NULL"))
+        conn.execute(text(
+            "ALTER TABLE bonus_translations ADD CONSTRAINT bonus_translations_template_pk_fkey "
+            "FOREIGN KEY (template_pk) REFERENCES bonus_templates (pk)"))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX uq_bonus_translations_template_language "
+            "ON bonus_translations (template_pk, language)"))
+    if dropped:
+        logger.info("Dropped %d orphaned or duplicate translations", dropped)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -26,10 +26,15 @@ class StableConfig(Base):
     maximum_stake_to_wager = Column(JSON, default=[])
     maximum_withdraw = Column(JSON, default=[])
 
+    # Optimistic lock: every ORM update checks and increments it
+    version = Column(Integer, nullable=False, server_default="1")
+
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow,
                         onupdate=datetime.utcnow)
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"<StableConfig {self.provider}>"
 
@@ -41,7 +46,12 @@ class BonusTemplate(Base):
     """
     __tablename__ = "bonus_templates"
 
-    id = Column(String(255), primary_key=True, index=True)
+    # Surrogate key: translations reference it, so renaming a template (id)
+    # never touches its children
+    pk = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Human-readable template ID, used in URLs and the generated JSON
+    id = Column(String(255), nullable=False, unique=True, index=True)
     # e.g., "Black Friday: Casino Reload 200% up to €300 21.11.25"
 
     # SCHEDULE
@@ -96,6 +106,12 @@ class BonusTemplate(Base):
     translations = relationship(
         "BonusTranslation", back_populates="template", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Serves month browsing / date range filters and keyset pagination
+        # ordered by (created_at, id)
+        Index("ix_bonus_templates_created_at_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<BonusTemplate {self.id}>"
 
@@ -108,8 +124,8 @@ class BonusTranslation(Base):
     __tablename__ = "bonus_translations"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    template_id = Column(String(255), ForeignKey(
-        "bonus_templates.id"), nullable=False)
+    template_pk = Column(Integer, ForeignKey(
+        "bonus_templates.pk"), nullable=False)
 
     # Language code, e.g., "en", "de", "fr", "pt", "es", "it", "pl", "ru", "tr", "az"
     language = Column(String(10), nullable=False)
@@ -130,8 +146,16 @@ class BonusTranslation(Base):
 
     template = relationship("BonusTemplate", back_populates="translations")
 
+    __table_args__ = (
+        # One row per template and language ("en", "GBP_en", ...); the language
+        # already carries the currency variant. Also serves template_pk lookups
+        # and is the conflict target of translation upserts.
+        Index("uq_bonus_translations_template_language",
+              "template_pk", "language", unique=True),
+    )
+
     def __repr__(self):
-        return f"<BonusTranslation {self.template_id}:{self.language}>"
+        return f"<BonusTranslation {self.template_pk}:{self.language}>"
 
 
 class CurrencyReference(Base):
@@ -155,6 +179,21 @@ class CurrencyReference(Base):
         return f"<CurrencyReference {self.currency}: 1 EUR = {self.eur_rate}>"
 
 
+class CurrencyReferenceVersion(Base):
+    """
+    One row per published set of currency references.
+    The highest id is the current version; workers compare it with the version
+    of their in-memory rate snapshot to notice a swap.
+    """
+    __tablename__ = "currency_reference_versions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CurrencyReferenceVersion {self.id}>"
+
+
 class CustomLanguage(Base):
     """
     Stores user-defined custom languages for translations.
@@ -1,34 +1,60 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
+import asyncio
+import logging
+
+from services.logging_config import configure_logging
+
+configure_logging()
+logger = logging.getLogger("main")
 
 # Import routers when database is ready
 from api.bonus_templates import router as bonus_templates_router
 from api.stable_config import router as stable_config_router
 from api.custom_languages import router as custom_languages_router
-from database.database import init_db
+from api.currency_rates import router as currency_rates_router
+from database.database import DATABASE_READ_URL, init_db, async_engine, async_read_engine
+from api.middleware import ReadYourWritesMiddleware, RequestTimingMiddleware
+from services.currency_service import REFRESH_INTERVAL as CURRENCY_REFRESH_INTERVAL, watch_currency_snapshot
+from services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, metrics
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("🚀 CAMPEON CRM API starting...")
+    logger.info("🚀 CAMPEON CRM API starting...")
     init_db()
-    print("✅ Database initialized")
+    # Pick up currency rates published through other workers
+    rate_watcher = None
+    if CURRENCY_REFRESH_INTERVAL > 0:
+        rate_watcher = asyncio.create_task(
+            watch_currency_snapshot(CURRENCY_REFRESH_INTERVAL))
     yield
     # Shutdown
-    print("🛑 CAMPEON CRM API shutting down...")
+    logger.info("🛑 CAMPEON CRM API shutting down...")
+    if rate_watcher is not None:
+        rate_watcher.cancel()
+    if async_engine is not None:
+        await async_engine.dispose()
+    if async_read_engine is not None and async_read_engine is not async_engine:
+        await async_read_engine.dispose()
 
 app = FastAPI(
     title="CAMPEON CRM API",
     description="Collaborative offer management system",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson instead of the stdlib json for every dict/model response
+    default_response_class=ORJSONResponse,
 )
 
 # Add middleware
 app.add_middleware(GZipMiddleware, minimum_size=1000)
+if DATABASE_READ_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000",
@@ -37,6 +63,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so the measured latency includes compression and CORS handling
+app.add_middleware(RequestTimingMiddleware)
 
 # Include routers
 app.include_router(bonus_templates_router, prefix="/api",
@@ -45,8 +73,16 @@ app.include_router(stable_config_router, prefix="/api",
                    tags=["stable-config"])
 app.include_router(custom_languages_router, prefix="/api",
                    tags=["custom-languages"])
+app.include_router(currency_rates_router, prefix="/api",
+                   tags=["currency-rates"])
 
 
 @app.get("/health")
 def health_check():
     return {"status": "ok", "service": "CAMPEON CRM API", "timestamp": __import__("datetime").datetime.utcnow().isoformat()}
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Request, SQL and connection pool metrics in Prometheus text format"""
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,236 @@
+"""
+Config Import - Streams bonus templates back in from config.json exports.
+
+Reverses services.json_generator.generate_bonus_json: schedule, trigger and config
+keys map back onto BonusTemplate columns, and the trigger name/description maps
+are split into one BonusTranslation per language or currency variant ("en",
+"GBP_en"); the "*" default stays on the template. The file is parsed
+incrementally with ijson, so only the current bonus is held in memory, and
+templates are upserted in chunks through services.template_import.write_templates.
+
+The file may be an array of bonuses, a single bonus object, or any other layout
+given an ijson prefix (e.g. "bonuses.item" for {"bonuses": [...]}).
+
+Run from the backend directory with:
+    python -m services.config_import config.json [--prefix bonuses.item] [--skip-existing]
+"""
+
+import logging
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from services.template_import import (
+    CURRENCY_COLUMNS,
+    ImportResult,
+    ParsedTemplate,
+    convert_value,
+    write_templates,
+)
+
+logger = logging.getLogger(__name__)
+
+# config.json key -> BonusTemplate column, per section
+SCHEDULE_KEYS = {
+    "type": "schedule_type",
+    "from": "schedule_from",
+    "to": "schedule_to",
+}
+TRIGGER_KEYS = {
+    "minimumAmount": "minimum_amount",
+    "iterations": "trigger_iterations",
+    "type": "trigger_type",
+    "duration": "trigger_duration",
+}
+CONFIG_KEYS = {
+    "minimumStakeToWager": "minimum_stake_to_wager",
+    "maximumStakeToWager": "maximum_stake_to_wager",
+    "compensateOverspending": "compensate_overspending",
+    "maximumAmount": "maximum_amount",
+    "percentage": "percentage",
+    "wageringMultiplier": "wagering_multiplier",
+    "includeAmountOnTargetWagerCalculation": "include_amount_on_target_wager",
+    "capCalculationAmountToMaximumBonus": "cap_calculation_to_maximum",
+    "type": "bonus_type",
+    "withdrawActive": "withdraw_active",
+    "category": "category",
+    "provider": "provider",
+    "brand": "brand",
+    "maximumWithdraw": "maximum_withdraw",
+}
+
+# Every imported template row is written with these columns
+IMPORT_COLUMNS = ["id", "trigger_name", "trigger_description",
+                  *SCHEDULE_KEYS.values(), *TRIGGER_KEYS.values(), *CONFIG_KEYS.values()]
+
+# BonusTranslation.language is a String(10)
+MAX_LANGUAGE_LENGTH = 10
+
+
+def _section(bonus: Dict[str, Any], key: str) -> Dict[str, Any]:
+    value = bonus.get(key) or {}
+    if not isinstance(value, dict):
+        raise ValueError(f"'{key}' must be an object")
+    return value
+
+
+def _currency_map(column: str, values: Any) -> Optional[Dict[str, Any]]:
+    if values is None:
+        return None
+    if not isinstance(values, dict):
+        raise ValueError(f"{column}: expected an object of currency values")
+    result = {}
+    for currency, value in values.items():
+        # maximumWithdraw is exported as {"EUR": {"cap": 100}}, stored flat
+        if isinstance(value, dict):
+            value = value.get("cap")
+        number = convert_value(column, value)
+        if number is not None:
+            result[currency] = number
+    return result
+
+
+def _text_map(key: str, values: Any) -> Dict[str, str]:
+    if values is None:
+        return {}
+    if not isinstance(values, dict):
+        raise ValueError(f"trigger.{key}: expected an object of languages")
+    return {str(language): str(text) for language, text in values.items() if text is not None}
+
+
+def parse_bonus(bonus: Any) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Build the template row and its translation rows from one config.json bonus.
+    Raises ValueError with a readable message for invalid bonuses.
+    """
+    if not isinstance(bonus, dict):
+        raise ValueError("Bonus must be an object")
+    template_id = bonus.get("id")
+    if not template_id or not isinstance(template_id, str):
+        raise ValueError("Missing template id")
+
+    template: Dict[str, Any] = {"id": template_id.strip()}
+    for section, keys in (("schedule", SCHEDULE_KEYS), ("trigger", TRIGGER_KEYS), ("config", CONFIG_KEYS)):
+        values = _section(bonus, section)
+        for key, column in keys.items():
+            if column in CURRENCY_COLUMNS:
+                template[column] = _currency_map(column, values.get(key))
+            else:
+                template[column] = convert_value(column, values.get(key))
+
+    trigger = _section(bonus, "trigger")
+    names = _text_map("name", trigger.get("name"))
+    descriptions = _text_map("description", trigger.get("description"))
+
+    # The "*" default lives on the template, everything else is a translation
+    default_name = names.pop("*", None)
+    default_description = descriptions.pop("*", None)
+    template["trigger_name"] = {"*": default_name} if default_name is not None else None
+    template["trigger_description"] = {"*": default_description} if default_description is not None else None
+
+    translation_rows = []
+    for language in dict.fromkeys([*names, *descriptions]):
+        if len(language) > MAX_LANGUAGE_LENGTH:
+            raise ValueError(f"Language key '{language}' is longer than {MAX_LANGUAGE_LENGTH} characters")
+        name = names.get(language) or default_name
+        if not name:
+            raise ValueError(f"Translation '{language}' has a description but no name")
+        translation_rows.append({
+            "language": language,
+            "currency": None,
+            "name": name,
+            "description": descriptions.get(language),
+        })
+    return template, translation_rows
+
+
+def detect_prefix(source: IO[bytes]) -> str:
+    """ijson prefix of the bonuses: "item" for a top-level array, "" for a single object"""
+    if not source.seekable():
+        return "item"
+    position = source.tell()
+    head = source.read(1024).lstrip(b"\xef\xbb\xbf \t\r\n")
+    source.seek(position)
+    return "" if head.startswith(b"{") else "item"
+
+
+def iter_bonuses(source: IO[bytes], prefix: Optional[str] = None) -> Iterator[Tuple[int, Any]]:
+    """Yield (position, bonus) from a binary JSON stream without loading it whole"""
+    import ijson
+
+    if prefix is None:
+        prefix = detect_prefix(source)
+    yield from enumerate(ijson.items(source, prefix, use_float=True), start=1)
+
+
+def import_config(
+    db: Session,
+    source: IO[bytes],
+    prefix: Optional[str] = None,
+    update_existing: bool = True,
+) -> ImportResult:
+    """
+    Upsert the bonuses of a config.json stream. Each bonus is reported by its
+    position in the file. Invalid JSON stops the import after the chunks
+    already committed and is reported as an error.
+    """
+    import ijson
+
+    result = ImportResult()
+
+    def parse_bonuses() -> Iterator[ParsedTemplate]:
+        try:
+            for position, bonus in iter_bonuses(source, prefix):
+                result.processed += 1
+                try:
+                    template, translations = parse_bonus(bonus)
+                except ValueError as e:
+                    bonus_id = bonus.get("id") if isinstance(bonus, dict) else None
+                    result.add_error(position, bonus_id if isinstance(bonus_id, str) else None, str(e))
+                    continue
+                yield position, template, translations
+        except ijson.JSONError as e:
+            # yajl messages point at the error over several lines; keep the first
+            message = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+            result.add_error(result.processed + 1, None, f"Invalid JSON: {message}")
+
+    return write_templates(db, parse_bonuses(), IMPORT_COLUMNS, result, update_existing=update_existing)
+
+
+def import_config_file(source: Union[str, IO[bytes]], prefix: Optional[str] = None,
+                       update_existing: bool = True) -> ImportResult:
+    """Import a config.json (path or binary file object) with its own session"""
+    from database.database import SessionLocal
+
+    stream = open(source, "rb") if isinstance(source, str) else source
+    db = SessionLocal()
+    try:
+        return import_config(db, stream, prefix=prefix, update_existing=update_existing)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        if stream is not source:
+            stream.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from services.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Import bonus templates from a config.json export")
+    parser.add_argument("path")
+    parser.add_argument("--prefix", help='ijson prefix of the bonuses (default: "item" for arrays)')
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="Report existing templates instead of overwriting them")
+    args = parser.parse_args()
+
+    configure_logging()
+    try:
+        outcome = import_config_file(args.path, prefix=args.prefix, update_existing=not args.skip_existing)
+    except OSError as e:
+        parser.error(str(e))
+    print(json.dumps(outcome.as_dict(), indent=2, default=str))
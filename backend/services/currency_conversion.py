@@ -0,0 +1,120 @@
+"""
+Currency Conversion - Vectorized EUR to all-currency conversion for many templates.
+
+The EUR base values of every converted field of every template are gathered into
+one (templates x fields) matrix, multiplied by the rate vector of the current
+currency snapshot and rounded per field kind and currency in a single NumPy pass.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from database.models import BonusTemplate
+from services.currency_service import CurrencySnapshot, get_currency_snapshot
+
+# Template columns converted from their EUR value, in matrix column order
+AMOUNT_FIELDS = ("minimum_amount", "maximum_amount")
+STAKE_FIELDS = ("minimum_stake_to_wager", "maximum_stake_to_wager")
+CONVERTED_FIELDS = AMOUNT_FIELDS + STAKE_FIELDS
+
+# Deposit and bonus amounts are whole units in every currency (as convert_eur_to_currency)
+AMOUNT_DECIMALS = 0
+# Stakes keep the currency's minor unit (ISO 4217)
+DEFAULT_STAKE_DECIMALS = 2
+STAKE_DECIMALS = {"CLP": 0, "JPY": 0}
+
+
+def rounding_decimals(field: str, currency: str) -> int:
+    """Decimals a converted value of field is rounded to in currency"""
+    if field in AMOUNT_FIELDS:
+        return AMOUNT_DECIMALS
+    return STAKE_DECIMALS.get(currency, DEFAULT_STAKE_DECIMALS)
+
+
+# Key of a per-currency dict the other currencies are converted from, and the
+# EUR value used when the dict lacks it: amounts convert their "EUR" value,
+# stakes their "*" default
+EUR_BASES = {
+    "minimum_amount": ("EUR", 25),
+    "maximum_amount": ("EUR", 300),
+    "minimum_stake_to_wager": ("*", 0.5),
+    "maximum_stake_to_wager": ("*", 5),
+}
+
+
+def eur_base(field: str, values: Optional[Mapping[str, Any]]) -> float:
+    """EUR value the converted values of field are derived from, NaN if not a number"""
+    key, default = EUR_BASES[field]
+    value = (values or {}).get(key, default)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class CurrencyConverter:
+    """Rate vector and rounding scales of one currency snapshot"""
+
+    def __init__(self, snapshot: CurrencySnapshot, fields: Sequence[str] = CONVERTED_FIELDS):
+        self.snapshot = snapshot
+        self.fields = tuple(fields)
+        self.currencies = tuple(snapshot.rates.keys())
+        self.rates = np.array(
+            [snapshot.rates[c]["rate"] for c in self.currencies], dtype=np.float64)
+
+        decimals = np.array([
+            [rounding_decimals(field, currency) for currency in self.currencies]
+            for field in self.fields
+        ])
+        self._scale = np.power(10.0, decimals)
+        self._whole = [bool((row == 0).all()) for row in decimals]
+        # Currencies rounded to whole units per field, returned as int like round()
+        self._whole_currencies = [np.flatnonzero(row == 0).tolist() for row in decimals]
+
+    def convert(self, base: np.ndarray) -> np.ndarray:
+        """
+        Convert a (templates x fields) matrix of EUR values into a
+        (templates x fields x currencies) matrix, rounded half to even like round().
+        NaN inputs stay NaN.
+        """
+        converted = base[:, :, None] * self.rates[None, None, :]
+        return np.round(converted * self._scale) / self._scale
+
+    def to_dicts(self, base: np.ndarray, converted: np.ndarray) -> List[Dict[str, Dict[str, Any]]]:
+        """Turn converted values into {field: {currency: value}} per template, skipping missing bases"""
+        results: List[Dict[str, Dict[str, Any]]] = [{} for _ in range(base.shape[0])]
+        for f, field in enumerate(self.fields):
+            present = ~np.isnan(base[:, f])
+            values = converted[:, f, :]
+            whole_currencies = []
+            if self._whole[f]:
+                values = np.where(np.isnan(values), 0, values).astype(np.int64)
+            else:
+                whole_currencies = self._whole_currencies[f]
+            for i, row in zip(np.flatnonzero(present).tolist(), values[present].tolist()):
+                for c in whole_currencies:
+                    row[c] = int(row[c])
+                results[i][field] = dict(zip(self.currencies, row))
+        return results
+
+    def convert_templates(self, templates: Iterable[BonusTemplate]) -> List[Dict[str, Dict[str, Any]]]:
+        """Convert every field of CONVERTED_FIELDS for each template"""
+        base = np.array(
+            [[eur_base(field, getattr(t, field)) for field in self.fields] for t in templates],
+            dtype=np.float64,
+        ).reshape(-1, len(self.fields))
+        return self.to_dicts(base, self.convert(base))
+
+
+_converter: Optional[CurrencyConverter] = None
+
+
+def get_converter() -> CurrencyConverter:
+    """Converter for the current currency snapshot, rebuilt when the snapshot is swapped"""
+    global _converter
+    snapshot = get_currency_snapshot()
+    converter = _converter
+    if converter is None or converter.snapshot is not snapshot:
+        converter = _converter = CurrencyConverter(snapshot)
+    return converter
@@ -1,6 +1,37 @@
-# Currency reference sheet - easily editable
+"""
+Currency Service - EUR conversion rates, languages and currency variants.
+
+Rates live in the currency_references table and are served from an immutable
+in-memory snapshot, so conversions never query the database. Publishing new
+rates (PUT /api/currency-rates) replaces the table and records a new row in
+currency_reference_versions in one transaction; every worker polls that
+version and swaps in a fresh snapshot when it changes.
+
+Environment:
+    CURRENCY_RATES_REFRESH_SECONDS  version poll interval per worker, default 5 (0 disables)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database.models import CurrencyReference, CurrencyReferenceVersion
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = float(os.getenv("CURRENCY_RATES_REFRESH_SECONDS", "5"))
+
+# Default reference sheet, seeded into currency_references when the table is empty
 # Base currency is EUR
-CURRENCY_REFERENCE = {
+DEFAULT_CURRENCY_REFERENCE = {
     "EUR": {"rate": 1.0, "min_deposit": 25, "max_deposit": 300},
     "USD": {"rate": 1.0, "min_deposit": 25, "max_deposit": 300},
     "GBP": {"rate": 1.0, "min_deposit": 25, "max_deposit": 300},
@@ -41,25 +72,116 @@ LANGUAGE_CURRENCY_VARIANTS = {
 }
 
 
+@dataclass(frozen=True)
+class CurrencySnapshot:
+    """An immutable set of currency references and the version it was loaded from"""
+    version: int
+    # {currency: {"rate", "min_deposit", "max_deposit"}}
+    rates: Mapping[str, Mapping[str, Any]]
+
+    @classmethod
+    def build(cls, version: int, rates: Dict[str, Dict[str, Any]]) -> "CurrencySnapshot":
+        return cls(version=version, rates=MappingProxyType(
+            {currency: MappingProxyType(dict(values)) for currency, values in rates.items()}))
+
+
+# Version 0 is the built-in sheet, used until the database snapshot is loaded
+_snapshot = CurrencySnapshot.build(0, DEFAULT_CURRENCY_REFERENCE)
+_swap_lock = threading.Lock()
+
+
+def get_currency_snapshot() -> CurrencySnapshot:
+    """Return the current rate snapshot; callers should read it once per operation"""
+    return _snapshot
+
+
+def install_currency_snapshot(snapshot: CurrencySnapshot, force: bool = False) -> bool:
+    """
+    Make snapshot the current one unless a newer version is already installed.
+    Returns True if it was installed.
+    """
+    global _snapshot
+    with _swap_lock:
+        if not force and snapshot.version < _snapshot.version:
+            return False
+        _snapshot = snapshot
+    logger.info("Currency rate snapshot version %s installed (%d currencies)",
+                snapshot.version, len(snapshot.rates))
+    return True
+
+
+def rates_from_references(references: Iterable[CurrencyReference]) -> Dict[str, Dict[str, Any]]:
+    return {
+        ref.currency: {"rate": ref.eur_rate, "min_deposit": ref.min_deposit, "max_deposit": ref.max_deposit}
+        for ref in references
+    }
+
+
+def load_currency_snapshot(db: Session) -> CurrencySnapshot:
+    """Read the current version and its currency references from the database"""
+    # Version first: if a swap commits in between, the rows are newer than the
+    # version and the next poll reloads them, never the other way round
+    version = db.scalar(select(func.max(CurrencyReferenceVersion.id))) or 0
+    references = db.scalars(select(CurrencyReference)).all()
+    return CurrencySnapshot.build(version, rates_from_references(references))
+
+
+def refresh_currency_snapshot(force: bool = False) -> CurrencySnapshot:
+    """Reload the snapshot from the database if its version changed (or always, with force)"""
+    from database.database import SessionLocal
+
+    with SessionLocal() as db:
+        if not force:
+            version = db.scalar(select(func.max(CurrencyReferenceVersion.id))) or 0
+            if version == _snapshot.version:
+                return _snapshot
+        snapshot = load_currency_snapshot(db)
+    install_currency_snapshot(snapshot, force=force)
+    return _snapshot
+
+
+def seed_currency_references(db: Session) -> None:
+    """Insert the default reference sheet as version 1 if no rates were published yet"""
+    if db.scalar(select(func.count()).select_from(CurrencyReference)):
+        return
+    db.add_all([
+        CurrencyReference(currency=currency, eur_rate=values["rate"],
+                          min_deposit=values["min_deposit"], max_deposit=values["max_deposit"])
+        for currency, values in DEFAULT_CURRENCY_REFERENCE.items()
+    ])
+    db.add(CurrencyReferenceVersion())
+    db.commit()
+
+
+async def watch_currency_snapshot(interval: float) -> None:
+    """Poll the published version and swap in new rates; runs for the lifetime of a worker"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(refresh_currency_snapshot)
+        except Exception as e:
+            logger.warning("⚠️ Currency rate refresh failed: %s", e)
+
+
 def convert_eur_to_currency(eur_amount: float, currency: str) -> float:
-    """Convert EUR amount to specified currency using reference sheet"""
-    if currency not in CURRENCY_REFERENCE:
+    """Convert EUR amount to specified currency using the current rate snapshot"""
+    rates = _snapshot.rates.get(currency)
+    if rates is None:
         return eur_amount
-    rate = CURRENCY_REFERENCE[currency]["rate"]
-    return round(eur_amount * rate)
+    return round(eur_amount * rates["rate"])
 
 
 def get_all_currency_conversions(eur_amount: float) -> dict:
     """Convert EUR amount to all currencies"""
     conversions = {}
-    for currency in CURRENCY_REFERENCE.keys():
-        conversions[currency] = convert_eur_to_currency(eur_amount, currency)
+    for currency, rates in _snapshot.rates.items():
+        conversions[currency] = round(eur_amount * rates["rate"])
     return conversions
 
 
 def get_all_currencies():
     """Get list of all supported currencies"""
-    return list(CURRENCY_REFERENCE.keys())
+    return list(_snapshot.rates.keys())
 
 
 def get_all_languages():
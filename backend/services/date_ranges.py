@@ -0,0 +1,55 @@
+"""
+Date Ranges - Turns year / month / day filters into half-open datetime ranges.
+
+Filtering with `created_at >= start AND created_at < end` works the same on SQLite
+and PostgreSQL and lets the database use the index on created_at, unlike wrapping
+the column in strftime().
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+DateRange = Tuple[datetime, datetime]
+
+
+def period_range(year: int, month: Optional[int] = None, day: Optional[int] = None) -> DateRange:
+    """
+    Return [start, end) covering a whole year, month or day.
+    Raises ValueError for impossible dates (e.g. month 13).
+    """
+    if month is None:
+        return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+
+    if day is None:
+        start = datetime(year, month, 1)
+        if month == 12:
+            return start, datetime(year + 1, 1, 1)
+        return start, datetime(year, month + 1, 1)
+
+    start = datetime(year, month, day)
+    return start, start + timedelta(days=1)
+
+
+def parse_date_query(value: str) -> Optional[DateRange]:
+    """
+    Parse "YYYY-MM-DD", "YYYY-MM" or "YYYY" into a [start, end) range.
+    Returns None if the value is not one of those dates.
+    """
+    for fmt, parts in (("%Y-%m-%d", 3), ("%Y-%m", 2), ("%Y", 1)):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        # strptime accepts "2025-1"; only accept the zero-padded forms
+        if parsed.strftime(fmt) != value:
+            continue
+        try:
+            if parts == 3:
+                return period_range(parsed.year, parsed.month, parsed.day)
+            if parts == 2:
+                return period_range(parsed.year, parsed.month)
+            return period_range(parsed.year)
+        except (ValueError, OverflowError):
+            # The range end falls past datetime.max (year 9999)
+            return None
+    return None
@@ -0,0 +1,35 @@
+"""
+JSON Bodies - Pre-serialized JSON response bodies.
+
+Cached responses (rendered templates, stable configs) are serialized once with
+orjson and keep a gzip copy, compressed on first use, so a hot response is sent
+without encoding or compressing it again. GZipMiddleware passes responses that
+already carry a Content-Encoding through untouched.
+"""
+
+import gzip
+import os
+from typing import Any, Callable, Optional
+
+import orjson
+
+# Bodies below this size are sent uncompressed, as GZipMiddleware does (main.py)
+GZIP_MINIMUM_SIZE = 1000
+# Paid once per cached body, so the highest level is affordable
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "9"))
+
+# orjson's output matches json.dumps(..., ensure_ascii=False, separators=(",", ":"))
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(payload: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize to compact UTF-8 JSON"""
+    return orjson.dumps(payload, default=default, option=DUMPS_OPTIONS)
+
+
+def gzip_compress(body: bytes) -> Optional[bytes]:
+    """gzip copy of a body, or None when it is too small to be worth compressing"""
+    if len(body) < GZIP_MINIMUM_SIZE:
+        return None
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
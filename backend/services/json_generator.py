@@ -4,14 +4,16 @@ matching the config.json structure with all translations and currency conversion
 """
 
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
+import numpy as np
 from sqlalchemy.orm import Session
 from database.models import BonusTemplate, BonusTranslation
+from services.currency_conversion import CONVERTED_FIELDS, eur_base, get_converter
+from services.stable_config_cache import ProviderConfig
 from services.currency_service import (
     LANGUAGE_CURRENCY_VARIANTS,
     LANGUAGES,
     convert_eur_to_currency,
-    CURRENCY_REFERENCE
 )
 
 
@@ -31,7 +33,7 @@ def generate_bonus_json(template_id: str, db: Session) -> Optional[Dict[str, Any
 
     # Fetch all translations
     translations = db.query(BonusTranslation).filter(
-        BonusTranslation.template_id == template_id
+        BonusTranslation.template_pk == template.pk
     ).all()
 
     # Build translation dictionaries
@@ -122,26 +124,22 @@ def generate_bonus_json_with_currencies(template_id: str, db: Session) -> Option
     # Start with base JSON
     extended_json = base_json.copy()
 
-    # Get EUR base values
-    eur_min_amount = base_json["trigger"]["minimumAmount"].get("EUR", 25)
-    eur_max_amount = base_json["config"]["maximumAmount"].get("EUR", 300)
-    eur_min_stake = base_json["config"]["minimumStakeToWager"].get("*", 0.5)
-    eur_max_stake = base_json["config"]["maximumStakeToWager"].get("*", 5)
-
-    # Convert to all currencies
-    for currency in CURRENCY_REFERENCE.keys():
-        if currency == "EUR":
-            continue
-
-        # Convert amounts
-        min_converted = convert_eur_to_currency(eur_min_amount, currency)
-        max_converted = convert_eur_to_currency(eur_max_amount, currency)
-
-        # Add to minimumAmount
-        extended_json["trigger"]["minimumAmount"][currency] = min_converted
-
-        # Add to maximumAmount
-        extended_json["config"]["maximumAmount"][currency] = max_converted
+    # EUR base values, in CONVERTED_FIELDS order
+    targets = [
+        extended_json["trigger"]["minimumAmount"],
+        extended_json["config"]["maximumAmount"],
+        extended_json["config"]["minimumStakeToWager"],
+        extended_json["config"]["maximumStakeToWager"],
+    ]
+    base = np.array([[eur_base(field, values) for field, values in zip(CONVERTED_FIELDS, targets)]])
+
+    # Convert every field to all currencies in one pass
+    converter = get_converter()
+    converted = converter.to_dicts(base, converter.convert(base))[0]
+    for field, values in zip(CONVERTED_FIELDS, targets):
+        for currency, value in converted.get(field, {}).items():
+            if currency != "EUR":
+                values[currency] = value
 
     return extended_json
 
@@ -153,3 +151,105 @@ def format_bonus_json_for_output(bonus_json: Dict[str, Any], pretty: bool = True
         return json.dumps(bonus_json, indent=2, ensure_ascii=False)
     else:
         return json.dumps(bonus_json, ensure_ascii=False)
+
+
+def format_maximum_withdraw(template: BonusTemplate, admin_config: Optional[ProviderConfig] = None) -> Dict[str, Any]:
+    """
+    Build maximumWithdraw in the nested format with "cap".
+    Uses stored template data if available, falls back to the provider's admin config.
+    """
+    maximum_withdraw_formatted = {}
+
+    if template.maximum_withdraw:
+        stored_data = template.maximum_withdraw
+        # If stored as flat dict/JSON, convert to nested format
+        if isinstance(stored_data, dict):
+            for curr, val in stored_data.items():
+                if isinstance(val, dict):
+                    # Already nested format
+                    maximum_withdraw_formatted[curr] = val
+                else:
+                    # Flat value, wrap in cap
+                    maximum_withdraw_formatted[curr] = {"cap": val}
+    # Fallback to admin config if stored data is empty
+    elif admin_config and admin_config.withdraw_caps:
+        # Admin stores it as list of dicts with currency and cap, pre-parsed by the cache
+        for currency, cap in admin_config.withdraw_caps.items():
+            maximum_withdraw_formatted[currency] = dict(cap)
+
+    return maximum_withdraw_formatted
+
+
+def build_template_json(
+    template: BonusTemplate,
+    translations: Iterable[BonusTranslation],
+    admin_config: Optional[ProviderConfig] = None,
+) -> Dict[str, Any]:
+    """
+    Render the final JSON output for a bonus template from already loaded rows.
+    Does not touch the database, so callers can batch-load translations and configs.
+    """
+    maximum_withdraw_formatted = format_maximum_withdraw(
+        template, admin_config)
+
+    # Build multilingual name and description from translations
+    trigger_name = {}
+    trigger_description = {}
+
+    for translation in translations:
+        if translation.language:
+            if translation.name:
+                trigger_name[translation.language] = translation.name
+            if translation.description:
+                trigger_description[translation.language] = translation.description
+
+    # Set "*" (default) to English or first available translation
+    if "en" in trigger_name:
+        trigger_name["*"] = trigger_name["en"]
+    elif trigger_name:
+        trigger_name["*"] = next(iter(trigger_name.values()))
+
+    if "en" in trigger_description:
+        trigger_description["*"] = trigger_description["en"]
+    elif trigger_description:
+        trigger_description["*"] = next(iter(trigger_description.values()))
+
+    # Build the full JSON from stored data
+    json_output = {
+        "id": template.id,
+        "trigger": {
+            "type": template.trigger_type,
+            "duration": template.trigger_duration,
+            "minimumAmount": template.minimum_amount,
+        },
+        "config": {
+            "cost": template.maximum_amount,
+            "multiplier": template.maximum_amount,
+            "maximumBets": template.maximum_stake_to_wager,
+            "provider": template.provider,
+            "brand": template.brand,
+            "type": template.bonus_type,
+            "category": template.category,
+            "maximumWithdraw": maximum_withdraw_formatted,
+            "extra": {
+                "category": template.category,
+                "game": template.bonus_type  # Get from template data
+            }
+        },
+        "type": "bonus_template"
+    }
+
+    # Add trigger name and description if they exist
+    if trigger_name:
+        json_output["trigger"]["name"] = trigger_name
+    if trigger_description:
+        json_output["trigger"]["description"] = trigger_description
+
+    # Add schedule if it exists
+    if template.schedule_from and template.schedule_to:
+        json_output["trigger"]["schedule"] = {
+            "from": template.schedule_from,
+            "to": template.schedule_to
+        }
+
+    return json_output
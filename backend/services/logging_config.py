@@ -0,0 +1,67 @@
+"""
+Logging Config - Application logging setup.
+
+Records are handed to a background thread through a queue, so a log call inside a
+request only costs a queue put; stdout writes happen off the request path.
+
+Environment:
+    LOG_LEVEL   root level, default INFO (DEBUG enables the per-request tracing in the routers)
+    LOG_LEVELS  per-module overrides, e.g. "api.bonus_templates=DEBUG,sqlalchemy.engine=INFO"
+    ACCESS_LOG  "false" disables the per-request JSON access log
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+ACCESS_LOGGER = "access"
+
+_listener = None
+
+
+def _parse_levels(value: str):
+    levels = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging() -> None:
+    """Configure root, per-module and access loggers (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    app_handler = logging.StreamHandler(sys.stdout)
+    app_handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    # Access log lines are already JSON; emit them verbatim
+    access_handler = logging.StreamHandler(sys.stdout)
+    access_handler.setFormatter(logging.Formatter("%(message)s"))
+    access_handler.addFilter(lambda record: record.name == ACCESS_LOGGER)
+    app_handler.addFilter(lambda record: record.name != ACCESS_LOGGER)
+
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        log_queue, app_handler, access_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    access_logger = logging.getLogger(ACCESS_LOGGER)
+    access_logger.setLevel(
+        logging.INFO if os.getenv("ACCESS_LOG", "true").lower() in ("1", "true", "yes")
+        else logging.CRITICAL + 1)
+
+    for name, level in _parse_levels(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
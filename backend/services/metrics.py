@@ -0,0 +1,203 @@
+"""
+Metrics - In-process request, SQL and connection pool metrics in Prometheus text format.
+
+RequestTimingMiddleware records one observation per HTTP request. SQL statements
+are counted by engine event listeners and attributed to the request that ran
+them through a context variable, which follows the request into threadpool
+calls and async driver greenlets alike. Pool gauges are read at scrape time.
+
+Metrics are kept per worker process; with several workers each one exposes
+its own counters, as Prometheus expects from multi-process targets.
+"""
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Label used for requests that matched no route, so unknown paths cannot
+# create unbounded label values
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestSQLStats:
+    """SQL statements executed while serving one request"""
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_current_request: contextvars.ContextVar[Optional[RequestSQLStats]] = contextvars.ContextVar(
+    "current_request_sql_stats", default=None)
+
+
+class Histogram:
+    """Cumulative histogram series keyed by a tuple of label values"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            # [per-bucket counts (+Inf last), sum, count]
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+
+class MetricsRegistry:
+    """Thread-safe store of the application's counters and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.request_latency = Histogram(LATENCY_BUCKETS)
+        self.request_sql_count = Histogram(SQL_COUNT_BUCKETS)
+        self.request_sql_duration = Histogram(LATENCY_BUCKETS)
+        self.sql_statements: Dict[Tuple[str], int] = {}
+        self.sql_duration = Histogram(SQL_DURATION_BUCKETS)
+        self.engines: Dict[str, Engine] = {}
+
+    def observe_request(self, method: str, route: Optional[str], status_code: int,
+                        seconds: float, sql: RequestSQLStats) -> None:
+        route = route or UNMATCHED_ROUTE
+        with self._lock:
+            key = (method, route, str(status_code))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.request_latency.observe((method, route), seconds)
+            self.request_sql_count.observe((method, route), sql.count)
+            self.request_sql_duration.observe((method, route), sql.seconds)
+
+    def observe_statement(self, engine_name: str, seconds: float) -> None:
+        with self._lock:
+            key = (engine_name,)
+            self.sql_statements[key] = self.sql_statements.get(key, 0) + 1
+            self.sql_duration.observe(key, seconds)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            _render_counter(lines, "http_requests_total", "HTTP requests by route and status",
+                            ("method", "route", "status"), self.requests)
+            _render_histogram(lines, "http_request_duration_seconds",
+                              "HTTP request latency", ("method", "route"), self.request_latency)
+            _render_histogram(lines, "http_request_sql_statements",
+                              "SQL statements executed per HTTP request",
+                              ("method", "route"), self.request_sql_count)
+            _render_histogram(lines, "http_request_sql_duration_seconds",
+                              "Total SQL time per HTTP request",
+                              ("method", "route"), self.request_sql_duration)
+            _render_counter(lines, "db_statements_total", "SQL statements executed",
+                            ("engine",), self.sql_statements)
+            _render_histogram(lines, "db_statement_duration_seconds",
+                              "SQL statement execution time", ("engine",), self.sql_duration)
+            engines = dict(self.engines)
+        _render_pool_gauges(lines, engines)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_counter(lines, name, help_text, label_names, values) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in sorted(values.items()):
+        lines.append(f"{name}{_labels(label_names, labels)} {value}")
+
+
+def _render_histogram(lines, name, help_text, label_names, histogram: Histogram) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, (bucket_counts, total, count) in sorted(histogram.series.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets + (float("inf"),), bucket_counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+            bucket_labels = _labels(label_names, labels, 'le="%s"' % le)
+            lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{name}_sum{_labels(label_names, labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_labels(label_names, labels)} {count}")
+
+
+def _render_pool_gauges(lines, engines: Dict[str, Engine]) -> None:
+    gauges = (
+        ("db_pool_size", "Configured pool size", "size"),
+        ("db_pool_checked_out", "Connections currently checked out", "checkedout"),
+        ("db_pool_checked_in", "Idle connections in the pool", "checkedin"),
+        ("db_pool_overflow", "Connections open beyond pool_size (negative while below it)", "overflow"),
+    )
+    for name, help_text, method in gauges:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for engine_name, engine in sorted(engines.items()):
+            # Only QueuePool keeps these counters; StaticPool (SQLite) has none
+            reader = getattr(engine.pool, method, None)
+            if reader is not None:
+                lines.append(f"{name}{_labels(('engine',), (engine_name,))} {reader()}")
+
+
+metrics = MetricsRegistry()
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Count and time every statement run on a (sync) engine, and expose its pool"""
+    metrics.engines[name] = engine
+
+    # The start time lives on the execution context, not the connection: with
+    # StaticPool one DBAPI connection is shared by the threadpool workers, so
+    # statements of concurrent requests interleave on it
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_start", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        metrics.observe_statement(name, elapsed)
+        stats = _current_request.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+
+
+def start_request() -> Tuple[RequestSQLStats, contextvars.Token]:
+    """Begin collecting SQL stats for the current request"""
+    stats = RequestSQLStats()
+    return stats, _current_request.set(stats)
+
+
+def finish_request(token: contextvars.Token) -> None:
+    _current_request.reset(token)
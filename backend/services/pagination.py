@@ -0,0 +1,71 @@
+"""
+Pagination - Keyset (cursor) pagination over bonus templates ordered by
+(created_at DESC, id DESC).
+
+A cursor is an opaque, URL-safe token holding the (created_at, id) of the last
+row of the previous page. Each page is an index seek on (created_at, id) instead
+of an OFFSET scan, and rows inserted while paging never shift later pages.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, desc, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import BonusTemplate
+
+
+def encode_cursor(created_at: datetime, template_id: str) -> str:
+    """Build an opaque cursor pointing after the given row"""
+    raw = json.dumps([created_at.isoformat(), template_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, template_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(template_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def order_newest_first(query: Select) -> Select:
+    """Apply the stable (created_at DESC, id DESC) order used by all template listings"""
+    return query.order_by(desc(BonusTemplate.created_at), desc(BonusTemplate.id))
+
+
+async def keyset_page(db: AsyncSession, query: Select, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of templates after the cursor (or the first page if the cursor is empty).
+    query selects BonusTemplate columns, including created_at and id.
+    Returns the rows and the cursor of the next page, or None on the last page.
+    """
+    if cursor:
+        created_at, template_id = decode_cursor(cursor)
+        # The created_at <= bound is what lets the index seek straight to the cursor
+        query = query.where(
+            BonusTemplate.created_at <= created_at,
+            or_(
+                BonusTemplate.created_at < created_at,
+                and_(BonusTemplate.created_at == created_at,
+                     BonusTemplate.id < template_id)
+            )
+        )
+
+    # Fetch one extra row to know whether there is a next page
+    rows = (await db.execute(order_newest_first(query).limit(limit + 1))).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,234 @@
+"""
+Rate Recompute - Rewrites converted template amounts after currency rates change.
+
+Only values that were derived from EUR are touched: a currency key counts as
+derived when it equals the EUR base converted at the old rate (with the same
+base and rounding as services.currency_conversion). Manually entered values are left
+alone. Templates are scanned in keyset batches, pre-filtered in SQL to those
+whose JSON mentions a changed currency, and every batch is written with
+executemany UPDATEs and committed on its own.
+
+Run manually from the backend directory with:
+    python -m services.rate_recompute BRL=2.0:5.5 [PLN=4.0:4.3 ...]
+"""
+
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import String, bindparam, cast, or_, select, update
+
+from database.models import BonusTemplate
+from services.currency_conversion import CONVERTED_FIELDS, eur_base, rounding_decimals
+from services.render_cache import render_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+# {currency: (old_rate, new_rate)}
+RateChanges = Dict[str, Tuple[float, float]]
+
+
+def changed_rates(old: Mapping[str, float], new: Mapping[str, float]) -> RateChanges:
+    """Currencies present in both rate sets whose rate differs"""
+    return {
+        currency: (old[currency], new[currency])
+        for currency in old.keys() & new.keys()
+        if old[currency] != new[currency]
+    }
+
+
+@dataclass
+class RecomputeProgress:
+    """Progress of one recompute run, updated after every committed batch"""
+    version: int
+    currencies: List[str]
+    status: str = "pending"  # pending | running | done | failed
+    candidates_scanned: int = 0
+    templates_updated: int = 0
+    values_updated: int = 0
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# Runs started by this worker, by currency reference version
+recompute_jobs: Dict[int, RecomputeProgress] = {}
+_jobs_lock = threading.Lock()
+MAX_TRACKED_JOBS = 20
+
+
+def track_job(progress: RecomputeProgress) -> None:
+    with _jobs_lock:
+        recompute_jobs[progress.version] = progress
+        for version in sorted(recompute_jobs)[:-MAX_TRACKED_JOBS]:
+            del recompute_jobs[version]
+
+
+class _BatchRecomputer:
+    """Vectorized old/new conversion of the changed currencies for one batch"""
+
+    def __init__(self, changes: RateChanges):
+        self.currencies = sorted(changes)
+        self.old_rates = np.array([changes[c][0] for c in self.currencies], dtype=np.float64)
+        self.new_rates = np.array([changes[c][1] for c in self.currencies], dtype=np.float64)
+        decimals = np.array([
+            [rounding_decimals(f, c) for c in self.currencies] for f in CONVERTED_FIELDS
+        ])
+        self.scale = np.power(10.0, decimals)
+        self.whole = decimals == 0
+
+    def _convert(self, base: np.ndarray, rates: np.ndarray) -> np.ndarray:
+        return np.round(base[:, :, None] * rates[None, None, :] * self.scale) / self.scale
+
+    def rewrite(self, rows) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return {"_id", <field>: new JSON} for rows with derived values that change
+        (only changed fields are included) and the number of currency values changed.
+        """
+        n, f, k = len(rows), len(CONVERTED_FIELDS), len(self.currencies)
+        base = np.full((n, f), np.nan)
+        current = np.full((n, f, k), np.nan)
+        for i, row in enumerate(rows):
+            for j, name in enumerate(CONVERTED_FIELDS):
+                values = row[name]
+                base[i, j] = eur_base(name, values)
+                if not values:
+                    continue
+                for m, currency in enumerate(self.currencies):
+                    value = values.get(currency)
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        current[i, j, m] = value
+
+        old = self._convert(base, self.old_rates)
+        new = self._convert(base, self.new_rates)
+        # NaN (missing base or key) never compares close, so those stay untouched
+        stale = np.isclose(current, old, rtol=0, atol=1e-9) & (new != current)
+
+        updates = []
+        for i in np.flatnonzero(stale.any(axis=(1, 2))).tolist():
+            row = rows[i]
+            changed = {"_id": row["id"]}
+            for j in np.flatnonzero(stale[i].any(axis=1)).tolist():
+                name = CONVERTED_FIELDS[j]
+                values = dict(row[name])
+                for m in np.flatnonzero(stale[i, j]).tolist():
+                    value = new[i, j, m]
+                    values[self.currencies[m]] = int(value) if self.whole[j, m] else float(value)
+                changed[name] = values
+            updates.append(changed)
+        return updates, int(stale.sum())
+
+
+def recompute_converted_amounts(
+    changes: RateChanges,
+    progress: RecomputeProgress,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_batch: Optional[Callable[[RecomputeProgress], None]] = None,
+) -> RecomputeProgress:
+    """
+    Rewrite the derived currency values of every template affected by changes.
+    Each batch is read, recomputed and updated in its own transaction.
+    """
+    from database.database import SessionLocal
+
+    progress.status = "running"
+    progress.started_at = datetime.utcnow()
+    if not changes:
+        progress.status = "done"
+        progress.finished_at = datetime.utcnow()
+        return progress
+
+    recomputer = _BatchRecomputer(changes)
+    columns = [getattr(BonusTemplate, name) for name in CONVERTED_FIELDS]
+    # JSON is stored as text on SQLite and as json on PostgreSQL; both cast to text
+    mentions_changed = or_(*[
+        cast(column, String).like(f'%"{currency}"%')
+        for column in columns for currency in recomputer.currencies
+    ])
+    table = BonusTemplate.__table__
+
+    db = SessionLocal()
+    try:
+        last_id = None
+        while True:
+            query = select(BonusTemplate.id, *columns).where(mentions_changed)
+            if last_id is not None:
+                query = query.where(BonusTemplate.id > last_id)
+            # Lock the batch on PostgreSQL so concurrent edits are not overwritten
+            rows = db.execute(
+                query.order_by(BonusTemplate.id).limit(batch_size).with_for_update()
+            ).mappings().all()
+            if not rows:
+                break
+
+            updates, values_updated = recomputer.rewrite(rows)
+            # One executemany per set of changed columns
+            groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            for item in updates:
+                groups.setdefault(tuple(k for k in CONVERTED_FIELDS if k in item), []).append(item)
+            now = datetime.utcnow()
+            for names, params in groups.items():
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("_id"))
+                    .values({**{name: bindparam(name) for name in names}, "updated_at": now}),
+                    params,
+                )
+            db.commit()
+
+            for item in updates:
+                render_cache.invalidate(item["_id"])
+            progress.candidates_scanned += len(rows)
+            progress.templates_updated += len(updates)
+            progress.values_updated += values_updated
+            logger.info(
+                "Rate recompute v%s: scanned %d candidates, updated %d templates",
+                progress.version, progress.candidates_scanned, progress.templates_updated)
+            if on_batch is not None:
+                on_batch(progress)
+
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1]["id"]
+
+        progress.status = "done"
+    except Exception as e:
+        db.rollback()
+        progress.status = "failed"
+        progress.error = str(e)
+        logger.exception("Rate recompute v%s failed", progress.version)
+    finally:
+        db.close()
+        progress.finished_at = datetime.utcnow()
+    return progress
+
+
+def _parse_change(arg: str) -> Tuple[str, Tuple[float, float]]:
+    currency, rates = arg.split("=", 1)
+    old, new = rates.split(":", 1)
+    return currency.strip().upper(), (float(old), float(new))
+
+
+if __name__ == "__main__":
+    import sys
+
+    from services.logging_config import configure_logging
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m services.rate_recompute CUR=old_rate:new_rate [...]")
+        sys.exit(1)
+
+    configure_logging()
+    changes = dict(_parse_change(arg) for arg in sys.argv[1:])
+    result = recompute_converted_amounts(
+        changes, RecomputeProgress(version=0, currencies=sorted(changes)))
+    print(result.as_dict())
+    sys.exit(0 if result.status == "done" else 1)
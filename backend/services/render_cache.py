@@ -0,0 +1,119 @@
+"""
+Render Cache - In-process LRU cache of rendered bonus template JSON.
+
+Entries hold the serialized response body, its gzip copy and a strong ETag,
+keyed by template ID.
+Routers invalidate entries whenever something the rendered JSON depends on
+changes: the template itself, its translations, or its provider's stable config.
+
+The cache lives in each worker process, so invalidation only reaches the worker
+that handled the write. Run a single worker, or keep RENDER_CACHE_SIZE=0 to
+disable caching, when writes may hit other workers.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Optional
+
+from services.json_bodies import dumps, gzip_compress
+
+
+@dataclass(frozen=True)
+class RenderedTemplate:
+    """A rendered template ready to be sent as a response"""
+    template_id: str
+    provider: Optional[str]
+    body: bytes
+    etag: str
+
+    @cached_property
+    def gzip_body(self) -> Optional[bytes]:
+        """body compressed once, on first use; None for small bodies"""
+        return gzip_compress(self.body)
+
+
+def serialize_rendered(template_id: str, provider: Optional[str], payload: Dict[str, Any]) -> RenderedTemplate:
+    """Serialize rendered JSON with orjson and compute its strong ETag"""
+    body = dumps(payload)
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return RenderedTemplate(template_id=template_id, provider=provider, body=body, etag=etag)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class RenderCache:
+    """
+    Thread-safe LRU cache of RenderedTemplate entries.
+
+    Every invalidation bumps a version counter. Callers read the version before
+    loading from the database and pass it to put(), so a render that raced with
+    a write is never stored.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, RenderedTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, template_id: str) -> Optional[RenderedTemplate]:
+        with self._lock:
+            entry = self._entries.get(template_id)
+            if entry is not None:
+                self._entries.move_to_end(template_id)
+            return entry
+
+    def put(self, entry: RenderedTemplate, version: int) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[entry.template_id] = entry
+            self._entries.move_to_end(entry.template_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, template_id: str) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.pop(template_id, None)
+
+    def invalidate_provider(self, provider: Optional[str]) -> None:
+        """Drop every entry rendered for a provider (its stable config changed)"""
+        with self._lock:
+            self._version += 1
+            for template_id in [k for k, v in self._entries.items() if v.provider == provider]:
+                del self._entries[template_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+render_cache = RenderCache(max_size=int(os.getenv("RENDER_CACHE_SIZE", "1024")))
@@ -0,0 +1,175 @@
+"""
+Search Index - Indexed text search over bonus templates (id, provider, brand, category).
+
+SQLite uses an external-content FTS5 table with the trigram tokenizer, kept in sync
+by triggers on bonus_templates. PostgreSQL uses a pg_trgm GIN index on the
+concatenated search columns, which the database maintains itself.
+
+Rebuild from the backend directory with:
+    python -m services.search_index rebuild
+"""
+
+import logging
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "bonus_templates_fts"
+TRGM_INDEX = "ix_bonus_templates_search_trgm"
+
+# The trigram tokenizer cannot match anything shorter than one trigram
+MIN_INDEXED_QUERY_LENGTH = 3
+
+# Must be identical in the index definition and in queries for PostgreSQL to use the index
+PG_SEARCH_EXPRESSION = (
+    "(id || ' ' || coalesce(provider, '') || ' ' || "
+    "coalesce(brand, '') || ' ' || coalesce(category, ''))"
+)
+
+SQLITE_SETUP_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        id, provider, brand, category,
+        content='bonus_templates', content_rowid='rowid', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS bonus_templates_fts_ai AFTER INSERT ON bonus_templates BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, id, provider, brand, category)
+        VALUES (new.rowid, new.id, new.provider, new.brand, new.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS bonus_templates_fts_ad AFTER DELETE ON bonus_templates BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, id, provider, brand, category)
+        VALUES ('delete', old.rowid, old.id, old.provider, old.brand, old.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS bonus_templates_fts_au AFTER UPDATE ON bonus_templates BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, id, provider, brand, category)
+        VALUES ('delete', old.rowid, old.id, old.provider, old.brand, old.category);
+        INSERT INTO {FTS_TABLE}(rowid, id, provider, brand, category)
+        VALUES (new.rowid, new.id, new.provider, new.brand, new.category);
+    END
+    """,
+]
+
+_index_available = False
+
+
+def ensure_search_index(engine: Engine) -> bool:
+    """
+    Create the search index if it does not exist yet.
+    Returns False (and search falls back to LIKE scans) when the database
+    cannot provide it, e.g. SQLite without FTS5 or no permission for pg_trgm.
+    """
+    global _index_available
+
+    try:
+        with engine.begin() as conn:
+            if engine.dialect.name == "sqlite":
+                created = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                ), {"name": FTS_TABLE}).first() is None
+                for statement in SQLITE_SETUP_STATEMENTS:
+                    conn.execute(text(statement))
+                if created:
+                    # Index rows that existed before the FTS table
+                    conn.execute(text(
+                        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            elif engine.dialect.name == "postgresql":
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {TRGM_INDEX} ON bonus_templates "
+                    f"USING gin ({PG_SEARCH_EXPRESSION} gin_trgm_ops)"
+                ))
+            else:
+                _index_available = False
+                return False
+    except Exception as e:
+        logger.warning(
+            "⚠️ Search index unavailable, falling back to LIKE search: %s", e)
+        _index_available = False
+        return False
+
+    _index_available = True
+    return True
+
+
+def rebuild_search_index(engine: Engine) -> None:
+    """Rebuild the search index from the bonus_templates table"""
+    if not ensure_search_index(engine):
+        raise RuntimeError("Search index is not supported by this database")
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.execute(text(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            conn.execute(text(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+        else:
+            conn.execute(text(f"REINDEX INDEX {TRGM_INDEX}"))
+
+
+async def search_template_ids(db: AsyncSession, query_str: str, limit: int) -> List[str]:
+    """
+    Return IDs of templates whose id, provider, brand or category contain
+    query_str (case-insensitive), best matches first.
+    """
+    dialect = db.get_bind().dialect.name
+
+    if _index_available and len(query_str) >= MIN_INDEXED_QUERY_LENGTH:
+        if dialect == "sqlite":
+            # Quote as an FTS5 phrase so user input is never parsed as query syntax
+            phrase = '"' + query_str.replace('"', '""') + '"'
+            rows = await db.execute(text(
+                f"SELECT t.id FROM {FTS_TABLE} f "
+                f"JOIN bonus_templates t ON t.rowid = f.rowid "
+                f"WHERE {FTS_TABLE} MATCH :phrase "
+                f"ORDER BY f.rank LIMIT :limit"
+            ), {"phrase": phrase, "limit": limit})
+            return [row[0] for row in rows]
+
+        if dialect == "postgresql":
+            rows = await db.execute(text(
+                f"SELECT id FROM bonus_templates "
+                f"WHERE {PG_SEARCH_EXPRESSION} ILIKE :pattern "
+                f"ORDER BY similarity({PG_SEARCH_EXPRESSION}, :query) DESC, id "
+                f"LIMIT :limit"
+            ), {"pattern": f"%{_escape_like(query_str)}%", "query": query_str, "limit": limit})
+            return [row[0] for row in rows]
+
+    # Short queries or no index: unindexed substring scan, exact ID matches first
+    pattern = f"%{_escape_like(query_str)}%"
+    rows = await db.execute(text(
+        "SELECT id FROM bonus_templates "
+        "WHERE lower(id) LIKE lower(:pattern) ESCAPE '\\' "
+        "OR lower(coalesce(provider, '')) LIKE lower(:pattern) ESCAPE '\\' "
+        "OR lower(coalesce(brand, '')) LIKE lower(:pattern) ESCAPE '\\' "
+        "OR lower(coalesce(category, '')) LIKE lower(:pattern) ESCAPE '\\' "
+        "ORDER BY CASE WHEN lower(id) = lower(:query) THEN 0 ELSE 1 END, id "
+        "LIMIT :limit"
+    ), {"pattern": pattern, "query": query_str, "limit": limit})
+    return [row[0] for row in rows]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+if __name__ == "__main__":
+    import sys
+
+    from database.database import engine
+
+    if len(sys.argv) != 2 or sys.argv[1] != "rebuild":
+        print("Usage: python -m services.search_index rebuild")
+        sys.exit(1)
+
+    rebuild_search_index(engine)
+    print("✅ Search index rebuilt")
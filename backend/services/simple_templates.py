@@ -0,0 +1,169 @@
+"""
+Simple Templates - Bonus templates created from the simple JSON format (deposit form).
+
+build_simple_template turns one payload into BonusTemplate column values and the
+json_output echoed back to the client. create_simple_templates writes many of
+them with one duplicate check and one executemany INSERT.
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import BonusTemplate
+
+logger = logging.getLogger(__name__)
+
+# Config keys copied into json_output when present, in output order
+OUTPUT_CONFIG_KEYS = ("cost", "multiplier", "maximumBets", "maximumWithdraw",
+                      "provider", "brand", "type", "category", "extra")
+
+
+def _object(payload: Dict[str, Any], key: str) -> Dict[str, Any]:
+    value = payload.get(key) or {}
+    if not isinstance(value, dict):
+        raise ValueError(f"Field '{key}' must be an object")
+    return value
+
+
+def build_simple_template(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build (BonusTemplate column values, json_output) from one simple-format payload.
+    Every call returns the same column keys. Raises ValueError for invalid payloads.
+    """
+    template_id = payload.get("id")
+    if not template_id:
+        raise ValueError("Missing required field: id")
+    if not isinstance(template_id, str):
+        raise ValueError("Field 'id' must be a string")
+
+    trigger = _object(payload, "trigger")
+    config = _object(payload, "config")
+    schedule = _object(trigger, "schedule")
+
+    # Extract just the cap values from maximumWithdraw if they exist
+    max_withdraw = _object(config, "maximumWithdraw")
+    logger.debug("max_withdraw from payload = %s", max_withdraw)
+    max_withdraw_flattened = {
+        curr: val.get("cap", 0) if isinstance(val, dict) else val
+        for curr, val in max_withdraw.items()
+    }
+
+    # Build the FINAL JSON that will be stored - only include what was provided
+    final_json = {
+        "id": template_id,
+        "type": "bonus_template"
+    }
+
+    trigger_obj = {key: trigger[key] for key in ("type", "duration", "schedule") if trigger.get(key)}
+    if trigger_obj:
+        final_json["trigger"] = trigger_obj
+
+    config_obj = {}
+    for key in OUTPUT_CONFIG_KEYS:
+        value = max_withdraw_flattened if key == "maximumWithdraw" else config.get(key)
+        if value:
+            config_obj[key] = value
+    if config_obj:
+        final_json["config"] = config_obj
+
+    values = {
+        "id": template_id,
+        "schedule_from": schedule.get("from"),
+        "schedule_to": schedule.get("to"),
+        "trigger_name": {"*": "Bonus", "en": "Bonus"},
+        "trigger_description": {"*": "", "en": ""},
+        "trigger_type": trigger.get("type", "deposit"),
+        "trigger_iterations": 1,
+        "trigger_duration": trigger.get("duration", "7d"),
+        "minimum_amount": {"*": 0},
+        "percentage": 0,
+        "wagering_multiplier": 0,
+        "minimum_stake_to_wager": {"*": 0},
+        "maximum_stake_to_wager": config.get("maximumBets", {"*": 0}),
+        "maximum_amount": config.get("cost", {"*": 0}),
+        "maximum_withdraw": max_withdraw_flattened,
+        "category": config.get("category", "games"),
+        "provider": config.get("provider", "PRAGMATIC"),
+        "brand": config.get("brand", "PRAGMATIC"),
+        "bonus_type": config.get("type", "cost"),
+    }
+    return values, final_json
+
+
+def _insert_new(db: AsyncSession):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(BonusTemplate.__table__)
+    elif dialect == "postgresql":
+        stmt = pg_insert(BonusTemplate.__table__)
+    else:
+        raise NotImplementedError(
+            f"Bulk template creation is not supported on {dialect}")
+    # Templates created concurrently since the duplicate check are skipped, not errors
+    return stmt.on_conflict_do_nothing(index_elements=["id"]).returning(
+        BonusTemplate.__table__.c.id)
+
+
+async def create_simple_templates(db: AsyncSession, payloads: List[Dict[str, Any]],
+                                  all_or_nothing: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Create templates from simple-format payloads with one IN query for existing
+    IDs and one executemany INSERT. Does not commit; the caller owns the transaction.
+
+    Returns (results, created_count) with one result per payload, in order:
+    {"id", "status": "created" | "invalid" | "duplicate" | "exists" | "not_created",
+    "json_output" | "error"}. With all_or_nothing, nothing is inserted when any
+    payload fails the checks (the others are "not_created");
+    the caller must still roll back if an insert was skipped as a concurrent duplicate.
+    """
+    results: List[Dict[str, Any]] = []
+    # template_id -> (result index, column values, json_output)
+    pending: Dict[Any, Tuple[int, Dict[str, Any], Dict[str, Any]]] = {}
+
+    for index, payload in enumerate(payloads):
+        try:
+            values, output = build_simple_template(payload)
+        except ValueError as e:
+            template_id = payload.get("id")
+            results.append({"id": template_id if isinstance(template_id, str) else None,
+                            "status": "invalid", "error": str(e)})
+            continue
+        if values["id"] in pending:
+            results.append({"id": values["id"], "status": "duplicate",
+                            "error": f"Template ID '{values['id']}' appears more than once"})
+            continue
+        results.append({"id": values["id"], "status": "pending"})
+        pending[values["id"]] = (index, values, output)
+
+    if pending:
+        existing = set((await db.scalars(select(BonusTemplate.id).where(
+            BonusTemplate.id.in_(list(pending))))).all())
+        for template_id in existing:
+            index = pending.pop(template_id)[0]
+            results[index] = {"id": template_id, "status": "exists",
+                              "error": f"Template with ID '{template_id}' already exists"}
+
+    failed = len(results) - len(pending)
+    if all_or_nothing and failed:
+        for index, _, _ in pending.values():
+            results[index] = {"id": results[index]["id"], "status": "not_created",
+                              "error": "Not created because other templates failed"}
+        return results, 0
+
+    created = set()
+    if pending:
+        rows = [values for _, values, _ in pending.values()]
+        created = set((await db.execute(_insert_new(db), rows)).scalars().all())
+
+    for template_id, (index, _, output) in pending.items():
+        if template_id in created:
+            results[index] = {"id": template_id, "status": "created", "json_output": output}
+        else:
+            results[index] = {"id": template_id, "status": "exists",
+                              "error": f"Template with ID '{template_id}' already exists"}
+    return results, len(created)
@@ -0,0 +1,241 @@
+"""
+Stable Config Cache - In-process cache of pre-parsed provider stable configs.
+
+Each StableConfig row is decoded once into a ProviderConfig: its six pricing
+tables parsed into PricingTable objects with hash lookups by table id and by
+currency, the
+maximumWithdraw fallback already in rendered form, and the serialized API
+response. The JSON renderer, the export and the /stable-config endpoints all
+read from here instead of re-decoding the JSON columns.
+
+save_stable_config invalidates the provider after every write. Like the render
+cache, entries live per worker process, so writes only invalidate the worker
+that handled them.
+"""
+
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database.models import StableConfig
+from services.json_bodies import dumps, gzip_compress
+
+PRICING_FIELDS = (
+    "cost",
+    "maximum_amount",
+    "minimum_amount",
+    "minimum_stake_to_wager",
+    "maximum_stake_to_wager",
+    "maximum_withdraw",
+)
+
+
+@dataclass(frozen=True)
+class PricingTable:
+    """One pricing table: {"id", "name", "values": {currency: value}}"""
+    id: str
+    name: str
+    values: Mapping[str, float]
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """A provider's stable config, decoded once"""
+    id: int
+    provider: str
+    # {field: (PricingTable, ...)} in stored order
+    tables: Mapping[str, Tuple[PricingTable, ...]]
+    # {field: {table id: PricingTable}}
+    tables_by_id: Mapping[str, Mapping[str, PricingTable]]
+    # {field: {currency: {table id: value}}}
+    by_currency: Mapping[str, Mapping[str, Mapping[str, float]]]
+    # maximumWithdraw fallback in rendered form: {currency: {"cap": cap}}
+    withdraw_caps: Mapping[str, Mapping[str, Any]]
+    # StableConfigResponse JSON
+    body: bytes
+
+    @cached_property
+    def gzip_body(self) -> Optional[bytes]:
+        """body compressed once, on first use; None for small bodies"""
+        return gzip_compress(self.body)
+
+    def table(self, field: str, table_id: str) -> Optional[PricingTable]:
+        return self.tables_by_id.get(field, {}).get(table_id)
+
+    def value(self, field: str, table_id: str, currency: str) -> Optional[float]:
+        return self.by_currency.get(field, {}).get(currency, {}).get(table_id)
+
+
+def _parse_table(item: Any) -> Optional[PricingTable]:
+    if not isinstance(item, dict) or not isinstance(item.get("values"), dict):
+        return None
+    try:
+        values = {str(c): float(v) for c, v in item["values"].items()}
+    except (TypeError, ValueError):
+        return None
+    return PricingTable(id=str(item.get("id", "")), name=str(item.get("name", "")),
+                        values=MappingProxyType(values))
+
+
+def parse_stable_config(config: StableConfig) -> ProviderConfig:
+    """Decode a StableConfig row into a ProviderConfig"""
+    tables: Dict[str, Tuple[PricingTable, ...]] = {}
+    tables_by_id: Dict[str, Mapping[str, PricingTable]] = {}
+    by_currency: Dict[str, Mapping[str, Mapping[str, float]]] = {}
+    for field in PRICING_FIELDS:
+        parsed = tuple(t for t in map(_parse_table, getattr(config, field) or []) if t is not None)
+        tables[field] = parsed
+        # First table wins when ids repeat, as a scan of the list would find
+        tables_by_id[field] = MappingProxyType(
+            {t.id: t for t in reversed(parsed)})
+        index: Dict[str, Dict[str, float]] = {}
+        for table in parsed:
+            for currency, value in table.values.items():
+                index.setdefault(currency, {}).setdefault(table.id, value)
+        by_currency[field] = MappingProxyType(
+            {c: MappingProxyType(v) for c, v in index.items()})
+
+    # The renderer's maximumWithdraw fallback reads {"currency", "cap"} items
+    withdraw_caps = {}
+    for item in config.maximum_withdraw or []:
+        if isinstance(item, dict) and item.get("currency"):
+            withdraw_caps[item["currency"]] = MappingProxyType({"cap": item.get("cap", 0)})
+
+    body = dumps({
+        "provider": config.provider,
+        **{field: [{"id": t.id, "name": t.name, "values": dict(t.values)} for t in tables[field]]
+           for field in PRICING_FIELDS},
+        "id": config.id,
+        "version": config.version,
+        "created_at": config.created_at.isoformat() if config.created_at else None,
+        "updated_at": config.updated_at.isoformat() if config.updated_at else None,
+    })
+
+    return ProviderConfig(
+        id=config.id,
+        provider=config.provider,
+        tables=MappingProxyType(tables),
+        tables_by_id=MappingProxyType(tables_by_id),
+        by_currency=MappingProxyType(by_currency),
+        withdraw_caps=MappingProxyType(withdraw_caps),
+        body=body,
+    )
+
+
+_MISSING = object()
+
+
+class StableConfigCache:
+    """
+    Thread-safe provider -> ProviderConfig cache. Providers without a config are
+    cached as None. Uses the same version check as RenderCache, so a load that
+    raced with a save is never stored.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Optional[str], Optional[ProviderConfig]] = {}
+        self._all: Optional[List[ProviderConfig]] = None
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, provider: Optional[str]) -> Any:
+        """Cached ProviderConfig or None, or _MISSING when not cached"""
+        return self._entries.get(provider, _MISSING)
+
+    def put(self, provider: Optional[str], config: Optional[ProviderConfig], version: int) -> None:
+        with self._lock:
+            if version == self._version:
+                self._entries[provider] = config
+
+    def get_all(self) -> Optional[List[ProviderConfig]]:
+        return self._all
+
+    def put_all(self, configs: List[ProviderConfig], version: int) -> None:
+        with self._lock:
+            if version == self._version:
+                self._all = configs
+
+    def invalidate(self, provider: Optional[str]) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.pop(provider, None)
+            self._all = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._all = None
+
+
+stable_config_cache = StableConfigCache()
+
+
+def _first_per_provider(rows: Iterable[StableConfig]) -> Dict[str, StableConfig]:
+    # Keep the first row per provider (by id), like .first() does
+    first: Dict[str, StableConfig] = {}
+    for row in rows:
+        first.setdefault(row.provider, row)
+    return first
+
+
+async def get_provider_config(db: AsyncSession, provider: Optional[str]) -> Optional[ProviderConfig]:
+    """Cached config of one provider, loaded on first use"""
+    cached = stable_config_cache.get(provider)
+    if cached is not _MISSING:
+        return cached
+
+    version = stable_config_cache.version
+    row = (await db.scalars(select(StableConfig).where(
+        StableConfig.provider == provider
+    ).order_by(StableConfig.id))).first()
+    config = parse_stable_config(row) if row is not None else None
+    stable_config_cache.put(provider, config, version)
+    return config
+
+
+async def get_all_provider_configs(db: AsyncSession) -> List[ProviderConfig]:
+    """Cached configs of all rows, in id order"""
+    cached = stable_config_cache.get_all()
+    if cached is not None:
+        return cached
+
+    version = stable_config_cache.version
+    rows = (await db.scalars(select(StableConfig).order_by(StableConfig.id))).all()
+    configs = [parse_stable_config(row) for row in rows]
+    stable_config_cache.put_all(configs, version)
+    return configs
+
+
+def get_provider_configs(db: Session, providers: Iterable[Optional[str]]) -> Dict[Optional[str], Optional[ProviderConfig]]:
+    """Cached configs of several providers, loading the missing ones in one query (sync sessions)"""
+    result: Dict[Optional[str], Optional[ProviderConfig]] = {}
+    missing = set()
+    for provider in providers:
+        cached = stable_config_cache.get(provider)
+        if cached is _MISSING:
+            missing.add(provider)
+        else:
+            result[provider] = cached
+
+    if missing:
+        version = stable_config_cache.version
+        rows = _first_per_provider(db.scalars(select(StableConfig).where(
+            StableConfig.provider.in_([p for p in missing if p is not None])
+        ).order_by(StableConfig.id)))
+        for provider in missing:
+            row = rows.get(provider)
+            config = parse_stable_config(row) if row is not None else None
+            stable_config_cache.put(provider, config, version)
+            result[provider] = config
+    return result
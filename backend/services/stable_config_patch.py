@@ -0,0 +1,118 @@
+"""
+Stable Config Patch - JSON-patch style edits of stable config pricing tables.
+
+Operations address tables by id with JSON pointer paths:
+    /{field}/{table_id}                    add | replace | remove a whole table
+    /{field}/{table_id}/name               replace a table's name
+    /{field}/{table_id}/values/{currency}  add | replace | remove one cell
+
+Only the fields named by the operations are read, copied and written back.
+"""
+
+import copy
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from services.stable_config_cache import PRICING_FIELDS
+
+PATCH_OPS = ("add", "replace", "remove")
+
+
+class PatchError(ValueError):
+    """An operation cannot be applied to the current tables"""
+
+
+def _unescape(token: str) -> str:
+    # JSON pointer escaping (RFC 6901)
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def parse_path(path: str) -> Tuple[str, str, List[str]]:
+    """Split a path into (field, table id, remaining tokens)"""
+    if not path.startswith("/"):
+        raise PatchError(f"Path must start with '/': {path}")
+    tokens = [_unescape(t) for t in path[1:].split("/")]
+    if len(tokens) < 2 or not tokens[1]:
+        raise PatchError(f"Path must name a field and a table id: {path}")
+    if tokens[0] not in PRICING_FIELDS:
+        raise PatchError(
+            f"Unknown pricing field '{tokens[0]}'. Use one of: {', '.join(PRICING_FIELDS)}")
+    return tokens[0], tokens[1], tokens[2:]
+
+
+def touched_fields(operations: Sequence[Mapping[str, Any]]) -> List[str]:
+    """Fields changed by the operations, in PRICING_FIELDS order"""
+    fields = {parse_path(op["path"])[0] for op in operations}
+    return [field for field in PRICING_FIELDS if field in fields]
+
+
+def _number(value: Any, path: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise PatchError(f"Value at {path} must be a number")
+    return float(value)
+
+
+def _table(table_id: str, value: Any, path: str) -> Dict[str, Any]:
+    if not isinstance(value, dict) or not isinstance(value.get("values", {}), dict):
+        raise PatchError(f"Value at {path} must be an object with name and values")
+    return {
+        "id": table_id,
+        "name": str(value.get("name", "")),
+        "values": {str(c): _number(v, f"{path}/values/{c}") for c, v in value.get("values", {}).items()},
+    }
+
+
+def apply_patch(tables: Mapping[str, List[Dict[str, Any]]],
+                operations: Sequence[Mapping[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Apply operations in order to copies of the touched fields' tables.
+    Returns {field: new table list} for the touched fields only; all
+    operations are applied or, on PatchError, none.
+    """
+    result = {field: copy.deepcopy(list(tables.get(field) or []))
+              for field in touched_fields(operations)}
+
+    for op in operations:
+        kind, path = op["op"], op["path"]
+        if kind not in PATCH_OPS:
+            raise PatchError(f"Unsupported op '{kind}'. Use one of: {', '.join(PATCH_OPS)}")
+        field, table_id, rest = parse_path(path)
+        field_tables = result[field]
+        index = next((i for i, t in enumerate(field_tables)
+                      if isinstance(t, dict) and str(t.get("id")) == table_id), None)
+
+        if not rest:
+            if kind == "add":
+                if index is not None:
+                    raise PatchError(f"Table already exists: {path}")
+                field_tables.append(_table(table_id, op.get("value"), path))
+            elif index is None:
+                raise PatchError(f"Table not found: {path}")
+            elif kind == "replace":
+                field_tables[index] = _table(table_id, op.get("value"), path)
+            else:
+                del field_tables[index]
+            continue
+
+        if index is None:
+            raise PatchError(f"Table not found: {path}")
+        table = field_tables[index]
+
+        if rest == ["name"]:
+            if kind != "replace":
+                raise PatchError(f"Only replace is supported for {path}")
+            table["name"] = str(op.get("value", ""))
+        elif len(rest) == 2 and rest[0] == "values":
+            currency = rest[1]
+            values = table.setdefault("values", {})
+            if kind == "remove":
+                if currency not in values:
+                    raise PatchError(f"Cell not found: {path}")
+                del values[currency]
+            elif kind == "replace" and currency not in values:
+                raise PatchError(f"Cell not found: {path}")
+            else:
+                values[currency] = _number(op.get("value"), path)
+        else:
+            raise PatchError(f"Invalid path: {path}")
+
+    return result
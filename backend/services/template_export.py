@@ -0,0 +1,266 @@
+"""
+Template Export - Streams rendered bonus template JSON for many templates at once.
+Templates are read in keyset-ordered batches; translations and stable configs are
+loaded per batch instead of per template, so memory and query count stay bounded.
+
+The xlsx format writes stored template columns and one name/description column
+per translation language instead of rendered JSON, in the header layout that
+services.template_import reads back.
+"""
+
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from database.database import ReadSessionLocal
+from database.models import BonusTemplate, BonusTranslation
+from services.currency_conversion import get_converter
+from services.currency_service import LANGUAGES, get_currency_snapshot
+from services.json_bodies import dumps
+from services.json_generator import build_template_json
+from services.stable_config_cache import get_provider_configs
+from services.template_import import (
+    BOOLEAN_COLUMNS,
+    CURRENCY_COLUMNS,
+    FLOAT_COLUMNS,
+    INTEGER_COLUMNS,
+    STRING_COLUMNS,
+    TRANSLATION_COLUMNS,
+)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+DEFAULT_BATCH_SIZE = 500
+
+# Scalar template columns of the xlsx export, after id
+XLSX_SCALAR_COLUMNS = STRING_COLUMNS + INTEGER_COLUMNS + FLOAT_COLUMNS + BOOLEAN_COLUMNS
+
+# Bytes per chunk when streaming the finished workbook
+XLSX_CHUNK_SIZE = 64 * 1024
+
+
+def iter_template_batches(
+    db: Session,
+    provider: Optional[str] = None,
+    brand: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[List[BonusTemplate]]:
+    """
+    Yield filtered templates in batches ordered by ID.
+    Each batch continues after the last ID of the previous one (no OFFSET scans).
+    """
+    last_id = None
+    while True:
+        query = db.query(BonusTemplate)
+        if provider:
+            query = query.filter(BonusTemplate.provider == provider)
+        if brand:
+            query = query.filter(BonusTemplate.brand == brand)
+        if created_from:
+            query = query.filter(BonusTemplate.created_at >= created_from)
+        if created_to:
+            query = query.filter(BonusTemplate.created_at < created_to)
+        if last_id is not None:
+            query = query.filter(BonusTemplate.id > last_id)
+
+        batch = query.order_by(BonusTemplate.id).limit(batch_size).all()
+        if not batch:
+            return
+
+        yield batch
+
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1].id
+
+
+def iter_rendered_templates(
+    db: Session,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    convert_currencies: bool = False,
+    **filters,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the rendered JSON of every template matching the filters.
+    Runs one template query and one translation query per batch, plus one stable
+    config query for providers not cached yet. With convert_currencies, amounts and
+    stakes of the whole batch are converted to every currency in one vectorized pass.
+    """
+    for batch in iter_template_batches(db, batch_size=batch_size, **filters):
+        translations_by_template = load_translations(db, batch)
+
+        # Stable configs are per provider and come from the shared cache
+        configs_by_provider = get_provider_configs(db, {t.provider for t in batch})
+
+        conversions = get_converter().convert_templates(batch) if convert_currencies else None
+
+        for i, template in enumerate(batch):
+            rendered = build_template_json(
+                template,
+                translations_by_template.get(template.pk, []),
+                configs_by_provider.get(template.provider),
+            )
+            if conversions is not None:
+                add_currency_conversions(rendered, conversions[i])
+            yield rendered
+
+        # Release the batch from the identity map to keep memory flat
+        db.expunge_all()
+
+
+def load_translations(db: Session, batch: Iterable[BonusTemplate]) -> Dict[int, List[BonusTranslation]]:
+    """Translations of a batch of templates in one query, by template pk"""
+    translations_by_template: Dict[int, List[BonusTranslation]] = {}
+    for translation in db.query(BonusTranslation).filter(
+        BonusTranslation.template_pk.in_([t.pk for t in batch])
+    ).order_by(BonusTranslation.id):
+        translations_by_template.setdefault(
+            translation.template_pk, []).append(translation)
+    return translations_by_template
+
+
+def add_currency_conversions(rendered: Dict[str, Any], converted: Dict[str, Dict[str, Any]]) -> None:
+    """Merge converted values (non-EUR currencies) into the per-currency dicts of rendered JSON"""
+    trigger, config = rendered["trigger"], rendered["config"]
+    if "minimum_amount" in converted:
+        trigger["minimumAmount"] = _with_converted(trigger["minimumAmount"], converted["minimum_amount"])
+    if "maximum_amount" in converted:
+        # cost and multiplier both render maximum_amount
+        config["cost"] = config["multiplier"] = _with_converted(
+            config["cost"], converted["maximum_amount"])
+    if "maximum_stake_to_wager" in converted:
+        config["maximumBets"] = _with_converted(
+            config["maximumBets"], converted["maximum_stake_to_wager"])
+
+
+def _with_converted(values: Optional[Dict[str, Any]], converted: Dict[str, Any]) -> Dict[str, Any]:
+    # Copy: values is the template's JSON column and must not be mutated
+    merged = dict(values or {})
+    merged.update((currency, value) for currency, value in converted.items() if currency != "EUR")
+    return merged
+
+
+def stream_export(
+    export_format: str = "ndjson",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    convert_currencies: bool = False,
+    session_factory=ReadSessionLocal,
+    **filters,
+) -> Iterator[bytes]:
+    """
+    Stream rendered templates as NDJSON lines or as a single JSON array.
+    Opens its own session (from session_factory, the read replica by default)
+    because the response body is produced after the request handler has returned.
+    """
+    db = session_factory()
+    try:
+        rendered = iter_rendered_templates(
+            db, batch_size=batch_size, convert_currencies=convert_currencies, **filters)
+
+        if export_format == "ndjson":
+            for item in rendered:
+                yield dumps(item, default=str) + b"\n"
+            return
+
+        yield b"["
+        first = True
+        for item in rendered:
+            if not first:
+                yield b","
+            yield dumps(item, default=str)
+            first = False
+        yield b"]"
+    finally:
+        db.close()
+
+
+def _xlsx_languages(db: Session) -> List[str]:
+    """Stored translation languages: LANGUAGES order, each followed by its variants"""
+    stored = {language for (language,) in db.query(BonusTranslation.language).distinct()}
+
+    def sort_key(language: str):
+        base = language.rsplit("_", 1)[-1]
+        rank = LANGUAGES.index(base) if base in LANGUAGES else len(LANGUAGES)
+        return rank, base, language != base, language
+
+    return sorted(stored, key=sort_key)
+
+
+def write_xlsx(db: Session, target, batch_size: int = DEFAULT_BATCH_SIZE, **filters) -> int:
+    """
+    Write the matching templates to target (path or binary file) as an .xlsx workbook
+    in openpyxl write-only mode, which spools rows to disk instead of keeping cells.
+    Currency columns cover "*" and the currencies of the current rate snapshot.
+    Returns the number of templates written.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    def text_cell(value: str):
+        value = ILLEGAL_CHARACTERS_RE.sub("", value)
+        if not value.startswith("="):
+            return value
+        # Keep user text that looks like a formula as plain text
+        cell = WriteOnlyCell(worksheet, value)
+        cell.data_type = "s"
+        return cell
+
+    currencies = ["*"] + [c for c in get_currency_snapshot().rates if c != "*"]
+    languages = _xlsx_languages(db)
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Templates")
+    worksheet.append(
+        ["id", *XLSX_SCALAR_COLUMNS]
+        + [column if currency == "*" else f"{column}:{currency}"
+           for column in CURRENCY_COLUMNS for currency in currencies]
+        + [f"{column}:{language}" for language in languages for column in TRANSLATION_COLUMNS]
+    )
+
+    count = 0
+    for batch in iter_template_batches(db, batch_size=batch_size, **filters):
+        translations_by_template = load_translations(db, batch)
+        for template in batch:
+            texts = {t.language: t for t in translations_by_template.get(template.pk, [])}
+            row = [template.id, *(getattr(template, column) for column in XLSX_SCALAR_COLUMNS)]
+            for column in CURRENCY_COLUMNS:
+                values = getattr(template, column) or {}
+                row.extend(values.get(currency) for currency in currencies)
+            for language in languages:
+                translation = texts.get(language)
+                row.extend(getattr(translation, column) if translation else None
+                           for column in TRANSLATION_COLUMNS)
+            worksheet.append([text_cell(value) if isinstance(value, str) else value for value in row])
+            count += 1
+        db.expunge_all()
+
+    workbook.save(target)
+    return count
+
+
+def stream_xlsx_export(batch_size: int = DEFAULT_BATCH_SIZE, session_factory=ReadSessionLocal,
+                       **filters) -> Iterator[bytes]:
+    """
+    Build the workbook into a temporary file and stream it in chunks.
+    An .xlsx is a zip whose directory is written last, so no bytes can be
+    sent before the last row; memory stays flat while it is built.
+    """
+    db = session_factory()
+    try:
+        with tempfile.TemporaryFile(suffix=".xlsx") as spool:
+            write_xlsx(db, spool, batch_size=batch_size, **filters)
+            db.close()
+            spool.seek(0)
+            while chunk := spool.read(XLSX_CHUNK_SIZE):
+                yield chunk
+    finally:
+        db.close()
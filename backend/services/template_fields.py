@@ -0,0 +1,52 @@
+"""
+Template Fields - Sparse fieldsets for the bonus template read endpoints.
+
+A `fields=id,provider,brand` query parameter names the BonusTemplate columns a
+response carries ("*" for all of them). The endpoints select just those columns
+with a Core select returning rows instead of ORM objects, so the large
+per-language and per-currency JSON columns are neither transferred nor decoded
+unless a client asks for them.
+"""
+
+from typing import List, Optional, Sequence
+
+from sqlalchemy import JSON
+
+from database.models import BonusTemplate
+
+ALL_FIELDS = "*"
+
+# Public template columns; the integer pk stays internal
+TEMPLATE_FIELDS = tuple(column.name for column in BonusTemplate.__table__.columns if column.name != "pk")
+
+# Everything except the JSON maps (trigger_name, minimum_amount, ...)
+SCALAR_FIELDS = tuple(name for name in TEMPLATE_FIELDS
+                      if not isinstance(BonusTemplate.__table__.c[name].type, JSON))
+
+# What the list and month views show
+SUMMARY_FIELDS = ("id", "provider", "bonus_type", "created_at")
+
+
+def parse_fields(fields: Optional[str], default: Sequence[str]) -> List[str]:
+    """
+    Field names requested by a fields= parameter, in request order with id first.
+    No value (or an empty one) means default. Raises ValueError for unknown names.
+    """
+    if fields is None or not fields.strip():
+        names = list(default)
+    elif fields.strip() == ALL_FIELDS:
+        names = list(TEMPLATE_FIELDS)
+    else:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in TEMPLATE_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s): {', '.join(unknown)}. Use any of: {', '.join(TEMPLATE_FIELDS)}")
+    # id identifies every item, so it is always returned
+    return list(dict.fromkeys(["id", *names]))
+
+
+def template_columns(names: Sequence[str], *required: str) -> list:
+    """Columns to select for names, plus any required ones (e.g. the cursor keys) not among them"""
+    table = BonusTemplate.__table__
+    return [table.c[name] for name in dict.fromkeys([*names, *required])]
@@ -0,0 +1,458 @@
+"""
+Template Import - Streams bonus templates and translations out of Excel workbooks.
+
+The workbook is opened in openpyxl read-only mode and rows are consumed one at a
+time, so memory stays flat regardless of the row count. Valid rows are written
+in chunks: an executemany INSERT ... ON CONFLICT for the templates and one for
+their translations, committed per chunk. Invalid rows are reported with their
+row number and never abort the import.
+
+Sheet layout: a header row, then one template per row.
+    id                          template ID (required)
+    provider, brand, ...        any scalar BonusTemplate column
+    minimum_amount              per-currency columns: "*" value ...
+    minimum_amount:EUR          ... or one currency
+    name:en, description:en     translation of a language or variant ("name:GBP_en")
+
+Run from the backend directory with:
+    python -m services.template_import campaigns.xlsx [--sheet NAME] [--update-existing]
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import JSON, bindparam, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from database.models import BonusTemplate, BonusTranslation
+from services.render_cache import render_cache
+
+logger = logging.getLogger(__name__)
+
+# Templates per transaction
+IMPORT_CHUNK_SIZE = 500
+
+# Errors returned in the result; the count covers all of them
+MAX_REPORTED_ERRORS = 1000
+
+STRING_COLUMNS = (
+    "schedule_type", "schedule_from", "schedule_to", "trigger_type", "trigger_duration",
+    "category", "provider", "brand", "bonus_type",
+)
+INTEGER_COLUMNS = ("trigger_iterations",)
+FLOAT_COLUMNS = ("percentage", "wagering_multiplier")
+BOOLEAN_COLUMNS = (
+    "include_amount_on_target_wager", "cap_calculation_to_maximum",
+    "compensate_overspending", "withdraw_active",
+)
+CURRENCY_COLUMNS = (
+    "minimum_amount", "maximum_amount", "minimum_stake_to_wager",
+    "maximum_stake_to_wager", "maximum_withdraw",
+)
+TRANSLATION_COLUMNS = ("name", "description")
+
+HEADER_ALIASES = {
+    "template_id": "id",
+    "bonus_id": "id",
+}
+
+TRUE_VALUES = {"1", "true", "yes", "y", "x"}
+FALSE_VALUES = {"0", "false", "no", "n"}
+
+# Empty cells of these columns get the model default, as when the form omits them
+COLUMN_DEFAULTS = {
+    column.name: column.default.arg
+    for column in BonusTemplate.__table__.columns
+    if column.default is not None and column.default.is_scalar
+}
+
+
+@dataclass
+class ImportResult:
+    """Outcome of one workbook import"""
+    processed: int = 0
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    translations: int = 0
+    error_count: int = 0
+    # [{"row": 12, "id": "...", "error": "..."}]
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row: int, template_id: Optional[str], error: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "id": template_id, "error": error})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "translations": self.translations,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+# Parsed header: (kind, column, key) with kind "column" | "currency" | "translation"
+Header = Optional[Tuple[str, str, Optional[str]]]
+
+
+def parse_header(value: Any) -> Header:
+    """Map a header cell onto a template column, currency key or translation"""
+    if value is None or str(value).strip() == "":
+        return None
+    name, _, key = str(value).strip().partition(":")
+    name = "_".join(name.strip().lower().replace("-", " ").split())
+    name = HEADER_ALIASES.get(name, name)
+    key = key.strip() or None
+
+    if name in CURRENCY_COLUMNS:
+        return "currency", name, key.upper() if key and key != "*" else "*"
+    if name in TRANSLATION_COLUMNS and key:
+        return "translation", name, key
+    if key is None and (name == "id" or name in STRING_COLUMNS or name in INTEGER_COLUMNS
+                        or name in FLOAT_COLUMNS or name in BOOLEAN_COLUMNS):
+        return "column", name, None
+    raise ValueError(f"Unknown column '{value}'")
+
+
+def convert_value(column: str, value: Any) -> Any:
+    """Convert one value to the column's type (empty is None). Raises ValueError"""
+    if isinstance(value, str):
+        value = value.strip()
+    if value is None or value == "":
+        return None
+    if column in BOOLEAN_COLUMNS:
+        if isinstance(value, bool):
+            return value
+        text = str(value).lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError(f"{column}: expected yes/no, got '{value}'")
+    if column in INTEGER_COLUMNS:
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{column}: expected a whole number, got '{value}'")
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            raise ValueError(f"{column}: expected a whole number, got '{value}'")
+    if column in FLOAT_COLUMNS or column in CURRENCY_COLUMNS:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{column}: expected a number, got '{value}'")
+        # Whole currency amounts stay integers, as the form stores them
+        if column in CURRENCY_COLUMNS and number.is_integer():
+            return int(number)
+        return number
+    if isinstance(value, datetime):
+        # Schedules are stored as "21-11-2025 10:00"
+        return value.strftime("%d-%m-%Y %H:%M")
+    return str(value)
+
+
+def parse_row(headers: List[Header], values: Tuple[Any, ...]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Build the template row and its translation rows from one sheet row.
+    Raises ValueError with a readable message for invalid cells.
+    """
+    template: Dict[str, Any] = {}
+    translations: Dict[str, Dict[str, Any]] = {}
+
+    for header, value in zip(headers, values):
+        if header is None:
+            continue
+        kind, column, key = header
+        if kind == "column":
+            template[column] = convert_value(column, value)
+        elif kind == "currency":
+            number = convert_value(column, value)
+            if number is not None:
+                template.setdefault(column, {})[key] = number
+        elif value is not None and str(value).strip():
+            translations.setdefault(key, {})[column] = str(value).strip()
+
+    template_id = template.get("id")
+    if not template_id:
+        raise ValueError("Missing template id")
+    template["id"] = str(template_id).strip()
+
+    # Mirror the form: a currency map with only EUR also gets the "*" default
+    for column in CURRENCY_COLUMNS:
+        values_by_currency = template.get(column)
+        if values_by_currency and "*" not in values_by_currency and "EUR" in values_by_currency:
+            values_by_currency["*"] = values_by_currency["EUR"]
+
+    translation_rows = []
+    for language, texts in translations.items():
+        if not texts.get("name"):
+            raise ValueError(f"Translation '{language}' has a description but no name")
+        translation_rows.append({
+            "language": language,
+            "currency": None,
+            "name": texts["name"],
+            "description": texts.get("description"),
+        })
+    return template, translation_rows
+
+
+def open_worksheet(source: Union[str, IO[bytes]], sheet: Optional[str] = None):
+    """
+    Open a workbook in read-only streaming mode and return (workbook, worksheet).
+    Raises ValueError if the file is not a readable workbook or has no such sheet.
+    """
+    from zipfile import BadZipFile
+
+    import openpyxl
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    except (InvalidFileException, BadZipFile, OSError) as e:
+        raise ValueError(f"Could not read workbook: {e}") from e
+    if sheet and sheet not in workbook.sheetnames:
+        workbook.close()
+        raise ValueError(f"Worksheet '{sheet}' not found")
+    return workbook, workbook[sheet] if sheet else workbook.active
+
+
+def iter_sheet_rows(worksheet) -> Iterator[Tuple[int, Tuple[Any, ...]]]:
+    """Yield (row number, values) of a worksheet, header first"""
+    for row_number, values in enumerate(worksheet.iter_rows(values_only=True), start=1):
+        yield row_number, values
+
+
+def _dialect_insert(db: Session, table):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite_insert(table)
+    if dialect == "postgresql":
+        return pg_insert(table)
+    raise NotImplementedError(f"Template import is not supported on {dialect}")
+
+
+def template_upsert_statement(db: Session, columns: List[str], update_existing: bool):
+    """
+    INSERT ... ON CONFLICT for templates, executed with one parameter set per row.
+    Built on the Core table so executemany batches rows into multi-row VALUES
+    with a statement compiled once per import. An existing template keeps its
+    stored value wherever the row has NULL.
+    """
+    table = BonusTemplate.__table__
+    stmt = _dialect_insert(db, table)
+    if update_existing:
+        # None must bind as SQL NULL for COALESCE, not as the JSON 'null' the
+        # JSON columns write by default
+        stmt = stmt.values({
+            column: bindparam(column, type_=JSON(none_as_null=True))
+            if isinstance(table.c[column].type, JSON) else bindparam(column)
+            for column in columns + ["created_at", "updated_at"]
+        })
+        set_ = {column: func.coalesce(stmt.excluded[column], table.c[column])
+                for column in columns if column != "id"}
+        set_["updated_at"] = stmt.excluded.updated_at
+        stmt = stmt.on_conflict_do_update(index_elements=["id"], set_=set_)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=["id"])
+    return stmt.returning(table.c.id, table.c.pk, table.c.created_at)
+
+
+def translation_upsert_statement(db: Session):
+    """Same upsert as services.translations, for executemany"""
+    stmt = _dialect_insert(db, BonusTranslation.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["template_pk", "language"],
+        set_={column: stmt.excluded[column]
+              for column in ("currency", "name", "description", "updated_at")},
+    )
+
+
+# A parsed template ready to write: (row number, column values, translation rows)
+ParsedTemplate = Tuple[int, Dict[str, Any], List[Dict[str, Any]]]
+
+
+def write_templates(
+    db: Session,
+    parsed: Iterable[ParsedTemplate],
+    columns: List[str],
+    result: ImportResult,
+    update_existing: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[ImportResult], None]] = None,
+) -> ImportResult:
+    """
+    Write parsed templates in chunks, committing each chunk. Every template row
+    is written with the given columns (empty ones get the model default).
+    Repeated IDs are reported as errors, as are existing IDs unless update_existing
+    is set, in which case the non-empty columns and the translations overwrite them.
+    """
+    # Every row carries the same keys, so both statements are compiled once
+    template_insert = template_upsert_statement(db, columns, update_existing)
+    translation_upsert = translation_upsert_statement(db)
+
+    seen_ids = set()
+    pending: List[ParsedTemplate] = []
+
+    def flush():
+        if not pending:
+            return
+        now = datetime.utcnow()
+        # Empty cells of existing templates stay NULL so the upsert keeps the
+        # stored values instead of resetting them to the defaults
+        existing = set()
+        if update_existing:
+            ids = [template["id"] for _, template, _ in pending]
+            existing = set(db.scalars(select(BonusTemplate.id).where(BonusTemplate.id.in_(ids))))
+        template_rows = []
+        for _, template, _ in pending:
+            row = {
+                column: template.get(column)
+                if template.get(column) is not None or template["id"] in existing
+                else COLUMN_DEFAULTS.get(column)
+                for column in columns
+            }
+            row["created_at"] = now
+            row["updated_at"] = now
+            template_rows.append(row)
+
+        # created_at only equals this chunk's timestamp on rows that were inserted
+        written, pks = {}, {}
+        for row in db.execute(template_insert, template_rows):
+            written[row.id] = row.created_at == now
+            pks[row.id] = row.pk
+        translation_rows = []
+        for row_number, template, translations in pending:
+            if template["id"] not in written:
+                result.skipped += 1
+                result.add_error(row_number, template["id"], "Template already exists")
+                continue
+            if written[template["id"]]:
+                result.created += 1
+            else:
+                result.updated += 1
+            for translation in translations:
+                translation_rows.append({**translation, "template_pk": pks[template["id"]],
+                                         "created_at": now, "updated_at": now})
+
+        if translation_rows:
+            db.execute(translation_upsert, translation_rows)
+        result.translations += len(translation_rows)
+        db.commit()
+
+        if update_existing:
+            for template_id, created in written.items():
+                if not created:
+                    render_cache.invalidate(template_id)
+        pending.clear()
+        if on_chunk is not None:
+            on_chunk(result)
+
+    for row_number, template, translations in parsed:
+        if template["id"] in seen_ids:
+            result.add_error(row_number, template["id"], "Duplicate template id in file")
+            continue
+        seen_ids.add(template["id"])
+
+        pending.append((row_number, template, translations))
+        if len(pending) >= chunk_size:
+            flush()
+    flush()
+
+    logger.info("Imported %d templates (%d created, %d updated, %d errors)",
+                result.created + result.updated, result.created, result.updated, result.error_count)
+    return result
+
+
+def import_templates(
+    db: Session,
+    rows: Iterator[Tuple[int, Tuple[Any, ...]]],
+    update_existing: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[ImportResult], None]] = None,
+) -> ImportResult:
+    """
+    Import templates from (row number, values) pairs whose first pair is the header.
+    Existing template IDs are reported as errors unless update_existing is set,
+    in which case the imported columns and translations overwrite them.
+    """
+    result = ImportResult()
+
+    try:
+        header_row_number, header_values = next(rows)
+    except StopIteration:
+        return result
+    try:
+        headers = [parse_header(value) for value in header_values]
+    except ValueError as e:
+        result.add_error(header_row_number, None, str(e))
+        return result
+    if ("column", "id", None) not in headers:
+        result.add_error(header_row_number, None, "Header row has no id column")
+        return result
+    id_index = headers.index(("column", "id", None))
+
+    def parse_rows() -> Iterator[ParsedTemplate]:
+        for row_number, values in rows:
+            if not any(v is not None and str(v).strip() for v in values):
+                continue
+            result.processed += 1
+            try:
+                template, translations = parse_row(headers, values)
+            except ValueError as e:
+                raw_id = values[id_index] if id_index < len(values) else None
+                result.add_error(row_number, str(raw_id).strip() if raw_id is not None else None, str(e))
+                continue
+            yield row_number, template, translations
+
+    columns = list(dict.fromkeys(h[1] for h in headers if h and h[0] != "translation"))
+    return write_templates(db, parse_rows(), columns, result, update_existing=update_existing,
+                           chunk_size=chunk_size, on_chunk=on_chunk)
+
+
+def import_workbook(source: Union[str, IO[bytes]], sheet: Optional[str] = None,
+                    update_existing: bool = False) -> ImportResult:
+    """
+    Import a workbook (path or binary file object) with its own session.
+    Raises ValueError if the workbook cannot be read.
+    """
+    from database.database import SessionLocal
+
+    workbook, worksheet = open_worksheet(source, sheet)
+    db = SessionLocal()
+    try:
+        return import_templates(db, iter_sheet_rows(worksheet), update_existing=update_existing)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        workbook.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from services.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Import bonus templates from an Excel workbook")
+    parser.add_argument("path")
+    parser.add_argument("--sheet")
+    parser.add_argument("--update-existing", action="store_true")
+    args = parser.parse_args()
+
+    configure_logging()
+    try:
+        outcome = import_workbook(args.path, sheet=args.sheet, update_existing=args.update_existing)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(outcome.as_dict(), indent=2, default=str))
@@ -0,0 +1,119 @@
+"""
+Translations - Set-based writes of bonus template translations.
+
+Writes use the database's native INSERT ... ON CONFLICT DO UPDATE on the unique
+(template_pk, language) index, so each save is a single statement and two
+editors saving the same language at once can never create duplicate rows.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import BonusTemplate, BonusTranslation
+
+# {template_id: {language: {"name": ..., "description": ..., "currency": ...}}}
+TranslationMap = Dict[str, Dict[str, Dict[str, Any]]]
+
+# Rows per multi-row upsert statement (stays well below SQLite's bound-parameter limit)
+UPSERT_CHUNK_SIZE = 500
+
+
+def _upsert_statement(db: AsyncSession, rows: List[Dict[str, Any]]):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(BonusTranslation).values(rows)
+    elif dialect == "postgresql":
+        stmt = pg_insert(BonusTranslation).values(rows)
+    else:
+        raise NotImplementedError(
+            f"Translation upsert is not supported on {dialect}")
+
+    return stmt.on_conflict_do_update(
+        index_elements=[BonusTranslation.template_pk,
+                        BonusTranslation.language],
+        set_={
+            "currency": stmt.excluded.currency,
+            "name": stmt.excluded.name,
+            "description": stmt.excluded.description,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+
+
+async def upsert_translation(db: AsyncSession, template_pk: int, language: str, name: str,
+                             description: Optional[str] = None, currency: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Create or update one translation in a single statement and return the stored row.
+    Does not commit; the caller owns the transaction.
+    """
+    now = datetime.utcnow()
+    stmt = _upsert_statement(db, [{
+        "template_pk": template_pk,
+        "language": language,
+        "currency": currency,
+        "name": name,
+        "description": description,
+        "created_at": now,
+        "updated_at": now,
+    }]).returning(*BonusTranslation.__table__.columns)
+    return dict((await db.execute(stmt)).one()._mapping)
+
+
+async def bulk_upsert_translations(db: AsyncSession, translations: TranslationMap) -> Tuple[Dict[str, Dict[str, str]], int, int]:
+    """
+    Create or update translations for many templates: one template lookup plus
+    one multi-row upsert per UPSERT_CHUNK_SIZE rows.
+    Does not commit; the caller owns the transaction.
+
+    Returns (results, created_count, updated_count) where results maps
+    template_id -> language -> "created" | "updated" | "template_not_found".
+    """
+    template_ids = list(translations.keys())
+    if not template_ids:
+        return {}, 0, 0
+
+    # template_id -> pk of the templates that exist
+    found_ids = dict((await db.execute(select(BonusTemplate.id, BonusTemplate.pk).where(
+        BonusTemplate.id.in_(template_ids)))).all())
+    ids_by_pk = {pk: template_id for template_id, pk in found_ids.items()}
+
+    now = datetime.utcnow()
+    results: Dict[str, Dict[str, str]] = {}
+    rows = []
+
+    for template_id, languages in translations.items():
+        results[template_id] = {}
+        for language, item in languages.items():
+            if template_id not in found_ids:
+                results[template_id][language] = "template_not_found"
+                continue
+            rows.append({
+                "template_pk": found_ids[template_id],
+                "language": language,
+                "currency": item.get("currency"),
+                "name": item["name"],
+                "description": item.get("description"),
+                "created_at": now,
+                "updated_at": now,
+            })
+
+    created = updated = 0
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = _upsert_statement(db, rows[start:start + UPSERT_CHUNK_SIZE]).returning(
+            BonusTranslation.template_pk, BonusTranslation.language, BonusTranslation.created_at)
+        for template_pk, language, created_at in await db.execute(stmt):
+            template_id = ids_by_pk[template_pk]
+            # Conflicting rows keep their original created_at
+            if created_at == now:
+                results[template_id][language] = "created"
+                created += 1
+            else:
+                results[template_id][language] = "updated"
+                updated += 1
+
+    return results, created, updated
@@ -0,0 +1,42 @@
+"""
+Test setup - every test session runs against a fresh SQLite database.
+
+DATABASE_URL is read when database.database is imported, so it is set here
+before any test module imports the app.
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_db_dir = tempfile.mkdtemp(prefix="casino_crm_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("DATABASE_ASYNC", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    from database.database import init_db
+    init_db()
+
+
+@pytest.fixture
+def db_session():
+    """Blocking session; bonus templates and translations are cleared afterwards"""
+    from database.database import SessionLocal
+    from database.models import BonusTemplate, BonusTranslation
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.query(BonusTranslation).delete()
+        session.query(BonusTemplate).delete()
+        session.commit()
+        session.close()
@@ -0,0 +1,90 @@
+"""Vectorized currency conversion against the per-currency loop it replaced"""
+
+import pytest
+
+from database.models import BonusTemplate
+from services.currency_conversion import CONVERTED_FIELDS, get_converter
+from services.currency_service import convert_eur_to_currency, get_currency_snapshot
+from services.json_generator import generate_bonus_json, generate_bonus_json_with_currencies
+
+CURRENCIES = ("BRL", "CLP", "JPY", "USD")
+
+
+def _baseline_amounts(template_id, db):
+    """Converted amounts as generate_bonus_json_with_currencies computed them one by one"""
+    base_json = generate_bonus_json(template_id, db)
+    eur_min_amount = base_json["trigger"]["minimumAmount"].get("EUR", 25)
+    eur_max_amount = base_json["config"]["maximumAmount"].get("EUR", 300)
+    return (
+        {c: convert_eur_to_currency(eur_min_amount, c) for c in CURRENCIES},
+        {c: convert_eur_to_currency(eur_max_amount, c) for c in CURRENCIES},
+    )
+
+
+@pytest.mark.parametrize("minimum_amount, maximum_amount", [
+    ({"EUR": 20}, {"EUR": 333}),
+    # No EUR value: the 25 / 300 fallback, not the "*" default
+    ({"*": 40}, {"*": 150}),
+    (None, None),
+])
+def test_amounts_match_baseline(db_session, minimum_amount, maximum_amount):
+    db_session.add(BonusTemplate(id="CONVERT_1", minimum_amount=minimum_amount,
+                                 maximum_amount=maximum_amount))
+    db_session.commit()
+    expected_min, expected_max = _baseline_amounts("CONVERT_1", db_session)
+    db_session.expire_all()
+
+    converted = generate_bonus_json_with_currencies("CONVERT_1", db_session)
+
+    for currency in CURRENCIES:
+        minimum = converted["trigger"]["minimumAmount"][currency]
+        maximum = converted["config"]["maximumAmount"][currency]
+        assert (minimum, maximum) == (expected_min[currency], expected_max[currency])
+        assert type(minimum) is int and type(maximum) is int
+
+
+def test_stakes_use_default_and_whole_units(db_session):
+    db_session.add(BonusTemplate(id="CONVERT_2",
+                                 minimum_stake_to_wager={"*": 0.37, "EUR": 9},
+                                 maximum_stake_to_wager={"*": 5}))
+    db_session.commit()
+
+    converted = generate_bonus_json_with_currencies("CONVERT_2", db_session)
+
+    rates = get_currency_snapshot().rates
+    for currency in ("CLP", "JPY"):
+        stake = converted["config"]["minimumStakeToWager"][currency]
+        assert stake == round(0.37 * rates[currency]["rate"])
+        assert type(stake) is int
+        assert type(converted["config"]["maximumStakeToWager"][currency]) is int
+    assert converted["config"]["minimumStakeToWager"]["BRL"] == round(0.37 * rates["BRL"]["rate"], 2)
+
+
+@pytest.mark.parametrize("values", [
+    # Amounts without "EUR" (the 25 / 300 defaults), stakes whose "EUR" differs from "*"
+    {"minimum_amount": {"*": 40}, "maximum_amount": {"*": 150},
+     "minimum_stake_to_wager": {"*": 0.37, "EUR": 9}, "maximum_stake_to_wager": {"*": 4, "EUR": 2}},
+    # Stakes without "*" (the 0.5 / 5 defaults)
+    {"minimum_amount": {"EUR": 20}, "maximum_amount": {"EUR": 333, "*": 1},
+     "minimum_stake_to_wager": {"EUR": 9}, "maximum_stake_to_wager": {"EUR": 2}},
+    # Nothing set
+    {},
+])
+def test_generator_matches_bulk_conversion(db_session, values):
+    db_session.add(BonusTemplate(id="CONVERT_3", **values))
+    db_session.commit()
+    template = db_session.query(BonusTemplate).filter_by(id="CONVERT_3").one()
+    bulk = get_converter().convert_templates([template])[0]
+    db_session.expire_all()
+
+    generated = generate_bonus_json_with_currencies("CONVERT_3", db_session)
+
+    generated_maps = [
+        generated["trigger"]["minimumAmount"],
+        generated["config"]["maximumAmount"],
+        generated["config"]["minimumStakeToWager"],
+        generated["config"]["maximumStakeToWager"],
+    ]
+    for field, generated_values in zip(CONVERTED_FIELDS, generated_maps):
+        expected = {c: v for c, v in bulk[field].items() if c != "EUR"}
+        assert {c: generated_values[c] for c in expected} == expected
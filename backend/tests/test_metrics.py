@@ -0,0 +1,53 @@
+"""Statement timing on an engine shared across threads"""
+
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+
+from services.metrics import finish_request, instrument_engine, metrics, start_request
+
+SLOW_SECONDS = 0.3
+
+
+def test_interleaved_statements_timed_separately():
+    engine = create_engine("sqlite://", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    slow_started = threading.Event()
+
+    @event.listens_for(engine, "connect")
+    def _add_sleep(dbapi_connection, connection_record):
+        def sleep(seconds):
+            slow_started.set()
+            time.sleep(seconds)
+            return seconds
+        dbapi_connection.create_function("sleep", 1, sleep)
+
+    instrument_engine(engine, "test_interleaved")
+    recorded = {}
+
+    def run(label, statement):
+        stats, token = start_request()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text(statement))
+        finally:
+            finish_request(token)
+        recorded[label] = stats.seconds
+
+    slow = threading.Thread(target=run, args=("slow", f"SELECT sleep({SLOW_SECONDS})"))
+    slow.start()
+    assert slow_started.wait(5)
+    # Starts halfway through the slow statement, which holds the shared connection
+    time.sleep(SLOW_SECONDS / 2)
+    fast = threading.Thread(target=run, args=("fast", "SELECT 1"))
+    fast.start()
+    slow.join()
+    fast.join()
+    metrics.engines.pop("test_interleaved", None)
+    engine.dispose()
+
+    assert recorded["slow"] >= SLOW_SECONDS
+    # Waited for the connection for about half of it
+    assert recorded["fast"] < recorded["slow"] - SLOW_SECONDS / 4
@@ -0,0 +1,59 @@
+"""Cursor pagination over templates of a legacy database"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+import database.database as database
+from database.database import SyncSessionAdapter, backfill_template_created_at, migrate_template_keys
+from database.models import BonusTemplate
+from services.pagination import keyset_page
+
+
+@pytest.fixture
+def legacy_engine(tmp_path, monkeypatch):
+    """Pre-surrogate-key schema whose created_at still allows NULL"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE bonus_templates (id VARCHAR(255) NOT NULL PRIMARY KEY, "
+            "provider VARCHAR(50), created_at DATETIME, updated_at DATETIME)"))
+        conn.execute(text(
+            "CREATE TABLE bonus_translations (id INTEGER NOT NULL PRIMARY KEY, "
+            "template_id VARCHAR(255), language VARCHAR(10), currency VARCHAR(10), "
+            "name VARCHAR(255), description TEXT, created_at DATETIME, updated_at DATETIME)"))
+        conn.execute(text(
+            "INSERT INTO bonus_templates (id, provider, created_at, updated_at) VALUES "
+            "('LEGACY_1', 'SYSTEM', NULL, NULL), "
+            "('LEGACY_2', 'SYSTEM', NULL, '2024-05-01 10:00:00.000000'), "
+            "('LEGACY_3', 'SYSTEM', '2025-01-01 10:00:00.000000', NULL), "
+            "('LEGACY_4', 'SYSTEM', '2025-02-01 10:00:00.000000', NULL)"))
+    monkeypatch.setattr(database, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def test_legacy_templates_reachable_by_cursor(legacy_engine):
+    backfill_template_created_at()
+    migrate_template_keys()
+
+    async def all_pages():
+        db = SyncSessionAdapter(Session(bind=legacy_engine))
+        ids, cursor = [], None
+        try:
+            while True:
+                query = select(BonusTemplate.id, BonusTemplate.created_at)
+                rows, cursor = await keyset_page(db, query, cursor, limit=1)
+                ids += [row.id for row in rows]
+                if cursor is None:
+                    return ids
+        finally:
+            await db.close()
+
+    ids = asyncio.run(all_pages())
+    assert sorted(ids) == ["LEGACY_1", "LEGACY_2", "LEGACY_3", "LEGACY_4"]
+    # Without an updated_at the backfill uses the current time: newest first
+    assert ids[0] == "LEGACY_1"
+    assert ids[-1] == "LEGACY_2"
@@ -0,0 +1,57 @@
+"""Rate recompute of values written by the JSON generator"""
+
+import copy
+
+from database.models import BonusTemplate
+from services.currency_conversion import CONVERTED_FIELDS, eur_base, rounding_decimals
+from services.currency_service import get_currency_snapshot
+from services.json_generator import generate_bonus_json_with_currencies
+from services.rate_recompute import RecomputeProgress, recompute_converted_amounts
+
+CHANGED = ("BRL", "JPY")
+
+
+def test_recompute_rewrites_generated_values(db_session):
+    # Amounts without "EUR" and stakes whose "EUR" differs from "*" convert
+    # from the 25 / 300 defaults and from "*"
+    db_session.add(BonusTemplate(
+        id="RECOMPUTE_1",
+        minimum_amount={"*": 40},
+        maximum_amount=None,
+        minimum_stake_to_wager={"*": 0.37, "EUR": 9},
+        maximum_stake_to_wager={"EUR": 2},
+    ))
+    db_session.commit()
+
+    # Save the generated per-currency values back, as a client editing the JSON would
+    generated = generate_bonus_json_with_currencies("RECOMPUTE_1", db_session)
+    db_session.rollback()
+    template = db_session.query(BonusTemplate).filter_by(id="RECOMPUTE_1").one()
+    saved = dict(zip(CONVERTED_FIELDS, copy.deepcopy([
+        generated["trigger"]["minimumAmount"],
+        generated["config"]["maximumAmount"],
+        generated["config"]["minimumStakeToWager"],
+        generated["config"]["maximumStakeToWager"],
+    ])))
+    for field, values in saved.items():
+        setattr(template, field, values)
+    db_session.commit()
+
+    rates = get_currency_snapshot().rates
+    changes = {c: (rates[c]["rate"], rates[c]["rate"] * 1.5) for c in CHANGED}
+    progress = recompute_converted_amounts(changes, RecomputeProgress(version=0, currencies=list(CHANGED)))
+
+    assert progress.status == "done"
+    assert progress.values_updated == len(CONVERTED_FIELDS) * len(CHANGED)
+    db_session.expire_all()
+    template = db_session.query(BonusTemplate).filter_by(id="RECOMPUTE_1").one()
+    for field in CONVERTED_FIELDS:
+        values = getattr(template, field)
+        base = eur_base(field, saved[field])
+        for currency in CHANGED:
+            decimals = rounding_decimals(field, currency)
+            expected = round(base * changes[currency][1], decimals)
+            assert values[currency] == (int(expected) if decimals == 0 else expected)
+        # Currencies whose rate did not change are left as generated
+        assert {c: v for c, v in values.items() if c not in CHANGED} == \
+            {c: v for c, v in saved[field].items() if c not in CHANGED}
@@ -0,0 +1,90 @@
+"""SyncSessionAdapter buffers results in the threadpool"""
+
+import asyncio
+import threading
+
+from sqlalchemy import event, select
+
+from database.database import SessionLocal, SyncSessionAdapter
+from database.models import BonusTemplate
+
+
+def _add_templates(db_session, count):
+    db_session.add_all([
+        BonusTemplate(id=f"adapter-{n}", provider="SYSTEM", bonus_type="cash")
+        for n in range(count)
+    ])
+    db_session.commit()
+
+
+def _record_loads():
+    """Threads in which BonusTemplate rows were hydrated, appended per row"""
+    loads = []
+
+    def on_load(target, context):
+        loads.append(threading.get_ident())
+
+    event.listen(BonusTemplate, "load", on_load)
+    return loads, lambda: event.remove(BonusTemplate, "load", on_load)
+
+
+def _run(coroutine_function):
+    async def main():
+        adapter = SyncSessionAdapter(SessionLocal(expire_on_commit=False))
+        try:
+            return await coroutine_function(adapter)
+        finally:
+            await adapter.close()
+    return asyncio.run(main())
+
+
+def test_execute_fetches_rows_in_threadpool(db_session):
+    _add_templates(db_session, 3)
+    loads, stop = _record_loads()
+    try:
+        async def query(adapter):
+            result = await adapter.execute(select(BonusTemplate).order_by(BonusTemplate.id))
+            fetched_on_return = list(loads)
+            return fetched_on_return, result.scalars().all()
+
+        fetched_on_return, templates = _run(query)
+    finally:
+        stop()
+
+    assert [template.id for template in templates] == ["adapter-0", "adapter-1", "adapter-2"]
+    assert len(fetched_on_return) == 3
+    assert threading.get_ident() not in fetched_on_return
+    assert loads == fetched_on_return
+
+
+def test_scalars_fetches_rows_in_threadpool(db_session):
+    _add_templates(db_session, 2)
+    loads, stop = _record_loads()
+    try:
+        async def query(adapter):
+            result = await adapter.scalars(select(BonusTemplate))
+            fetched_on_return = list(loads)
+            return fetched_on_return, result.all()
+
+        fetched_on_return, templates = _run(query)
+    finally:
+        stop()
+
+    assert len(templates) == 2
+    assert len(fetched_on_return) == 2
+    assert threading.get_ident() not in fetched_on_return
+
+
+def test_execute_returns_column_rows(db_session):
+    _add_templates(db_session, 2)
+
+    async def query(adapter):
+        result = await adapter.execute(
+            select(BonusTemplate.id, BonusTemplate.provider).order_by(BonusTemplate.id))
+        return result.mappings().all()
+
+    rows = _run(query)
+    assert [dict(row) for row in rows] == [
+        {"id": "adapter-0", "provider": "SYSTEM"},
+        {"id": "adapter-1", "provider": "SYSTEM"},
+    ]
@@ -0,0 +1,43 @@
+"""Workbook rows imported over existing templates"""
+
+from database.models import BonusTemplate, BonusTranslation
+from services.template_import import import_templates
+
+
+def _rows(*rows):
+    return iter(enumerate(rows, start=1))
+
+
+def test_partial_row_keeps_existing_values(db_session):
+    import_templates(db_session, _rows(
+        ("id", "provider", "percentage", "withdraw_active", "minimum_amount:EUR", "name:en"),
+        ("IMPORT_1", "PRAGMATIC", 200, "yes", 20, "Welcome"),
+    ))
+
+    result = import_templates(db_session, _rows(
+        ("id", "provider", "percentage", "withdraw_active", "minimum_amount:EUR", "name:en"),
+        ("IMPORT_1", None, 150, None, None, None),
+    ), update_existing=True)
+
+    assert (result.created, result.updated, result.error_count) == (0, 1, 0)
+    db_session.expire_all()
+    template = db_session.query(BonusTemplate).filter_by(id="IMPORT_1").one()
+    assert template.percentage == 150
+    assert template.provider == "PRAGMATIC"
+    # Not reset to the model default (False)
+    assert template.withdraw_active is True
+    assert template.minimum_amount == {"EUR": 20, "*": 20}
+    translation = db_session.query(BonusTranslation).filter_by(template_pk=template.pk).one()
+    assert translation.name == "Welcome"
+
+
+def test_update_existing_still_defaults_new_templates(db_session):
+    result = import_templates(db_session, _rows(
+        ("id", "provider", "withdraw_active", "schedule_type"),
+        ("IMPORT_2", "SYSTEM", None, None),
+    ), update_existing=True)
+
+    assert result.created == 1
+    template = db_session.query(BonusTemplate).filter_by(id="IMPORT_2").one()
+    assert template.withdraw_active is False
+    assert template.schedule_type == "period"